@@ -0,0 +1,2 @@
+from .runner import BenchmarkRunner, BenchmarkResult
+from .scenarios import SCENARIOS
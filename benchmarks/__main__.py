@@ -0,0 +1,40 @@
+import argparse
+
+from roguelike.model.logs import configure_logging
+from .runner import BenchmarkRunner
+from .scenarios import SCENARIOS, BenchmarkGame
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Rogue Dungeon benchmarks")
+    parser.add_argument("scenarios", nargs="*",
+                        help=f"which scenarios to run from {', '.join(SCENARIOS.keys())}.  Default is all of them")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file to write the results to")
+    parser.add_argument("--seed", type=int, default=1, help="random seed")
+    parser.add_argument("--quick", action="store_true", help="run fewer and smaller scenarios")
+    args = parser.parse_args()
+
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f'Unknown scenario {name}')
+
+    configure_logging()
+
+    runner = BenchmarkRunner(seed=args.seed, quick=args.quick)
+    scenarios = args.scenarios if len(args.scenarios) > 0 else list(SCENARIOS.keys())
+
+    game = BenchmarkGame(args.seed)
+
+    for name in scenarios:
+        count = len(runner.results)
+        SCENARIOS[name](runner, game)
+
+        for result in runner.results[count:]:
+            print(result)
+
+    runner.save(args.output)
+    print(f'Results saved to {args.output}')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+
+
+class BenchmarkResult():
+    """
+    Timings for one benchmark scenario run with one set of parameters
+    """
+
+    def __init__(self, name: str, params: dict, timings: list):
+        self.name = name
+        self.params = params
+        self.timings = timings
+
+    def to_dict(self) -> dict:
+        timings_ms = [t * 1000 for t in self.timings]
+        return {"name": self.name,
+                "params": self.params,
+                "repeats": len(timings_ms),
+                "min_ms": min(timings_ms),
+                "median_ms": statistics.median(timings_ms),
+                "mean_ms": statistics.mean(timings_ms),
+                "max_ms": max(timings_ms)}
+
+    def __str__(self):
+        d = self.to_dict()
+        params = ", ".join(f'{k}={v}' for k, v in self.params.items())
+        return f'{self.name:<24} {params:<36} median={d["median_ms"]:10.3f}ms min={d["min_ms"]:10.3f}ms (n={d["repeats"]})'
+
+
+class BenchmarkRunner():
+    """
+    Run benchmark scenarios and collect their results so that they can be written out as JSON
+    """
+
+    def __init__(self, seed: int = 1, quick: bool = False):
+        self.seed = seed
+        self.quick = quick
+        self.results = []
+
+    def time_it(self, name: str, params: dict, func, repeats: int, setup=None) -> BenchmarkResult:
+        """
+        Time how long a function takes to run
+        :param name: the name of the scenario
+        :param params: the parameters that the scenario was run with
+        :param func: the function to time.  It gets passed whatever setup returns
+        :param repeats: how many times to run the function
+        :param setup: optional function that gets called before each run but isn't timed
+        :return: the BenchmarkResult
+        """
+        timings = []
+        for i in range(repeats):
+            arg = setup() if setup is not None else None
+
+            start = time.perf_counter()
+            func(arg)
+            timings.append(time.perf_counter() - start)
+
+        result = BenchmarkResult(name, params, timings)
+        self.results.append(result)
+
+        return result
+
+    def to_dict(self) -> dict:
+        return {"meta": {"timestamp": datetime.now().isoformat(timespec="seconds"),
+                         "python": platform.python_version(),
+                         "platform": platform.platform(),
+                         "commit": self.get_git_commit(),
+                         "seed": self.seed,
+                         "quick": self.quick},
+                "results": [result.to_dict() for result in self.results]}
+
+    def save(self, file_name: str):
+        with open(file_name, "w") as results_file:
+            json.dump(self.to_dict(), results_file, indent=2)
+
+    @staticmethod
+    def get_git_commit():
+        try:
+            return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                  capture_output=True, text=True, check=True).stdout.strip()
+        except Exception:
+            return None
@@ -0,0 +1,190 @@
+import copy
+import random
+
+import numpy as np
+
+import roguelike.model as model
+import roguelike.view as view
+from roguelike.model.model import AIBotTracker
+
+
+class BenchmarkGame():
+    """
+    A Model with all of the game data loaded that the scenarios use to build their floors
+    """
+
+    def __init__(self, seed: int):
+        self.model = model.Model("Benchmark", seed=seed)
+        self.model.initialise(80, 50)
+
+    def get_floor_parameters(self, room_count: int = None) -> dict:
+        params = copy.deepcopy(self.model.load_game_parameters())
+        if room_count is not None:
+            params["Floor"]["Room"]["Count"] = room_count
+        return params
+
+    def new_floor(self, width: int = 80, height: int = 50, room_count: int = None, level: int = 1) -> model.Floor:
+        floor = model.Floor("Benchmark Floor", width, height, level=level,
+                            params=self.get_floor_parameters(room_count),
+                            seed=self.model.get_floor_seed(level))
+        floor.initialise(model.EventQueue())
+        return floor
+
+    def new_player(self) -> model.Player:
+        return self.model.generate_player(name="Benchmark", class_name="Wizard", race_name="Human")
+
+
+def random_walkable_positions(floor: model.Floor, count: int) -> list:
+    walkable = np.argwhere(floor.walkable)
+    return [tuple(walkable[random.randrange(len(walkable))]) for i in range(count)]
+
+
+def floor_generation(runner, game: BenchmarkGame):
+    """
+    How long does it take to generate a new Floor of different sizes and room counts?
+    """
+    sizes = [(50, 50), (80, 50)] if runner.quick else [(50, 50), (80, 50), (120, 80), (200, 120)]
+    room_counts = [5, 20] if runner.quick else [5, 10, 20, 40]
+    repeats = 3 if runner.quick else 10
+
+    for width, height in sizes:
+        for room_count in room_counts:
+            random.seed(runner.seed)
+            params = game.get_floor_parameters(room_count)
+
+            def setup():
+                return model.Floor("Benchmark Floor", width, height, level=5, params=copy.deepcopy(params),
+                                   seed=game.model.get_floor_seed(5))
+
+            runner.time_it("floor_generation",
+                           {"width": width, "height": height, "room_count": room_count},
+                           lambda floor: floor.initialise(model.EventQueue()),
+                           repeats, setup=setup)
+
+
+def fov(runner, game: BenchmarkGame):
+    """
+    How long does it take to recompute the player's FOV as they walk around a Floor with different numbers of entities?
+    """
+    entity_counts = [0, 100] if runner.quick else [0, 100, 1000, 5000]
+    repeats = 50 if runner.quick else 200
+
+    for entity_count in entity_counts:
+        random.seed(runner.seed)
+        floor = game.new_floor(80, 50, room_count=20)
+        floor.add_player(game.new_player())
+
+        # Add extra solid entities to the floor
+        for xy in random_walkable_positions(floor, entity_count):
+            floor.add_entity(model.EntityFactory.get_entity_by_name("Pillar"), xy)
+
+        positions = iter(random_walkable_positions(floor, repeats))
+
+        def setup():
+            floor.player.xy = next(positions)
+
+        runner.time_it("recompute_fov",
+                       {"entities": len(floor.entities)},
+                       lambda arg: floor.recompute_fov(),
+                       repeats, setup=setup)
+
+
+def bot_ticks(runner, game: BenchmarkGame):
+    """
+    How long does a Floor tick take with different numbers of bots on the Floor?
+    Bots that are far from the player are asleep so each count is run as it is and with every bot woken up.
+    """
+    bot_counts = [10, 100] if runner.quick else [10, 100, 1000, 5000]
+    repeats = 10 if runner.quick else 50
+    enemy_names = ["Giant Rat", "Goblin", "Kobold", "Gnoll"]
+
+    for bot_count in bot_counts:
+        for all_awake in (False, True):
+            random.seed(runner.seed)
+            floor = game.new_floor(120, 80, room_count=20)
+
+            # Replace the Floor's bots with the number that we want
+            floor.bots = []
+            for xy in random_walkable_positions(floor, bot_count):
+                enemy = model.EntityFactory.get_entity_by_name(random.choice(enemy_names))
+                floor.add_entity(enemy, xy)
+                floor.generate_new_enemy(enemy)
+                floor.bots.append(AIBotTracker(enemy, floor))
+
+            floor.add_player(game.new_player())
+
+            # Keep every bot awake for the whole run
+            if all_awake is True:
+                for bot in floor.bots:
+                    bot.wake(ticks=repeats * 2)
+
+            floor.update_bot_activity()
+            moves = [(1, 0), (-1, 0)]
+
+            def setup():
+                floor.player.heal(1000)
+                floor.move_player(*moves[0])
+                moves.reverse()
+
+            runner.time_it("floor_tick",
+                           {"bots": bot_count, "all_awake": all_awake, "active_bots": floor.active_bot_count},
+                           lambda arg: floor.tick(),
+                           repeats, setup=setup)
+
+
+def floor_view_draw(runner, game: BenchmarkGame):
+    """
+    How long does it take to draw a fully explored Floor into an offscreen console?
+    """
+    sizes = [(80, 50)] if runner.quick else [(80, 50), (120, 80), (200, 120)]
+    repeats = 10 if runner.quick else 50
+
+    for width, height in sizes:
+        random.seed(runner.seed)
+        floor = game.new_floor(width, height, room_count=20)
+        floor.add_player(game.new_player())
+        floor.reveal_map()
+
+        floor_view = view.FloorView(width, height)
+        floor_view.initialise(floor)
+
+        runner.time_it("floor_view_draw",
+                       {"width": width, "height": height},
+                       lambda arg: floor_view.draw(),
+                       repeats)
+
+
+def factory_lookups(runner, game: BenchmarkGame):
+    """
+    How long do lookups of game objects by name take?
+    """
+    repeats = 3 if runner.quick else 10
+    lookups = 100 if runner.quick else 1000
+
+    random.seed(runner.seed)
+    entity_names = [random.choice(["Pillar", "Food", "Goblin", "Down Stairs", "Corpse"]) for i in range(lookups)]
+    class_names = [random.choice(["Goblin", "Kobold", "Wizard", "Fighter"]) for i in range(lookups)]
+    equipment_names = [random.choice(["Dagger", "Longsword", "Mace", "Leather Armour"]) for i in range(lookups)]
+
+    def get_entities(arg):
+        for name in entity_names:
+            model.EntityFactory.get_entity_by_name(name)
+
+    def get_combat_classes(arg):
+        for name in class_names:
+            model.CombatClassFactory.get_combat_class_by_name(name)
+
+    def get_equipment(arg):
+        for name in equipment_names:
+            model.CombatEquipmentFactory.get_equipment_by_name(name)
+
+    runner.time_it("get_entity_by_name", {"lookups": lookups}, get_entities, repeats)
+    runner.time_it("get_combat_class_by_name", {"lookups": lookups}, get_combat_classes, repeats)
+    runner.time_it("get_equipment_by_name", {"lookups": lookups}, get_equipment, repeats)
+
+
+SCENARIOS = {"floor_generation": floor_generation,
+             "fov": fov,
+             "bot_ticks": bot_ticks,
+             "floor_view_draw": floor_view_draw,
+             "factory_lookups": factory_lookups}
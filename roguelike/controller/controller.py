@@ -6,6 +6,8 @@ import tcod as libtcod
 
 import roguelike.model as model
 import roguelike.view as view
+from roguelike.model.logs import controller_logger
+from .frame_timer import FrameTimer
 
 
 class Controller():
@@ -23,6 +25,11 @@ class Controller():
     GAME_FLOOR_WIDTH = 80
     GAME_FLOOR_HEIGHT = 50
 
+    # How long to pause after each turn so that the player can see what happened
+    TICK_DELAY_MS = 100
+
+    FRAME_TIMINGS_FILE = "frame_timings.json"
+
     def __init__(self, name: str):
         # Properties
         self.name = name
@@ -32,9 +39,10 @@ class Controller():
         self.view = None
         self.model = None
         self.events = None
+        self.frame_timer = FrameTimer()
 
     def initialise(self):
-        self.model = model.Model(self.name)
+        self.model = model.Model(self.name, prefetch_floors=True)
         self.model.initialise(Controller.GAME_FLOOR_WIDTH, Controller.GAME_FLOOR_HEIGHT)
         self.events = self.model.events
 
@@ -42,6 +50,7 @@ class Controller():
                                    Controller.GAME_FLOOR_HEIGHT + view.MainFrame.CONSOLE_MESSAGE_PANEL_HEIGHT+ 4)
         self.view.initialise(self.model)
         self.view.set_event_queue(self.model.events)
+        self.view.frame_timer = self.frame_timer
         self.set_mode(Controller.GAME_MODE_START)
         self.help()
 
@@ -105,6 +114,9 @@ class Controller():
 
         while not libtcod.console_is_window_closed():
 
+            self.frame_timer.start("frame")
+            self.frame_timer.start("events")
+
             # Loop to process game events
             event = self.model.get_next_event()
 
@@ -121,16 +133,20 @@ class Controller():
 
                 event = self.model.get_next_event()
 
+            self.frame_timer.stop("events")
+
             # Draw the view
-            self.view.draw()
+            with self.frame_timer.phase("draw"):
+                self.view.draw()
 
             # Wait for event.........
-            libtcod.sys_check_for_event(libtcod.EVENT_KEY_PRESS, key, mouse)
-            # key = libtcod.console_wait_for_keypress(True)
-            action = self.handle_keys(key)
+            with self.frame_timer.phase("input"):
+                libtcod.sys_check_for_event(libtcod.EVENT_KEY_PRESS, key, mouse)
+                # key = libtcod.console_wait_for_keypress(True)
+                action = self.handle_keys(key)
 
             if action is None:
-                print(f'key={key}, mode={self.mode}')
+                controller_logger.debug("key=%s, mode=%s", key, self.mode)
 
             # print(f'Game Mode={self.mode}; last mode={self.last_mode}')
 
@@ -150,6 +166,9 @@ class Controller():
                 self.model.print()
                 self.view.print()
 
+            if action.get('timings') is True:
+                self.frame_timer.toggle()
+
             if help is True:
                 self.help()
 
@@ -160,6 +179,7 @@ class Controller():
             # If we are in PLAYING mode
             elif self.mode == Controller.GAME_MODE_PLAYING:
                 player_turn = True
+                self.frame_timer.start("turn")
 
                 # Game playing actions
                 attack = action.get('attack')
@@ -214,8 +234,12 @@ class Controller():
 
                 if player_turn is False:
                     # Tick the model
-                    libtcod.sys_sleep_milli(100)
-                    self.model.tick()
+                    with self.frame_timer.phase("tick"):
+                        self.model.tick()
+                    self.frame_timer.stop("turn")
+
+                    # Pause so that the player can see what happened
+                    libtcod.sys_sleep_milli(Controller.TICK_DELAY_MS)
 
             # If we are in START mode
             elif self.mode == Controller.GAME_MODE_START:
@@ -364,12 +388,14 @@ class Controller():
                     if self.view.shop_view.mode == view.ShopView.MODE_BUY:
                         new_item = self.view.shop_view.get_selected_buy_item()
                         success = self.model.buy_item(new_item)
-                        print(f'Buying {self.view.shop_view.get_selected_buy_item().description}: success={success}')
+                        controller_logger.debug("Buying %s: success=%s",
+                                                self.view.shop_view.get_selected_buy_item().description, success)
 
                     elif self.view.shop_view.mode == view.ShopView.MODE_SELL:
                         old_item = self.view.shop_view.get_selected_sell_item()
                         success = self.model.sell_item(old_item)
-                        print(f'Selling {self.view.shop_view.get_selected_sell_item().description}: success={success}')
+                        controller_logger.debug("Selling %s: success=%s",
+                                                self.view.shop_view.get_selected_sell_item().description, success)
 
 
             # If we are in CHARACTER mode
@@ -405,6 +431,19 @@ class Controller():
             if fullscreen:
                 libtcod.console_set_fullscreen(not libtcod.console_is_fullscreen())
 
+            self.frame_timer.stop("frame")
+
+    def end(self):
+        """
+        Tidy up when the game ends
+        """
+        # If we recorded any frame timings then save them
+        if len(self.frame_timer.phases) > 0:
+            self.frame_timer.dump(Controller.FRAME_TIMINGS_FILE)
+
+        # Stop generating floors in the background
+        model.FloorPrefetcher.close()
+
     def game_save(self):
         file_name = f'{self.name}.sav'
         with open(file_name, "wb") as game_file:
@@ -420,6 +459,9 @@ class Controller():
         with open(file_name, "rb") as game_file:
             self.model = pickle.load(game_file)
 
+        # Carry on with the loaded game's random number streams
+        self.model.activate_random_streams()
+
         self.events = self.model.events
         self.view.initialise(self.model)
         self.view.set_event_queue(self.model.events)
@@ -482,6 +524,9 @@ class Controller():
         elif key.vk == libtcod.KEY_F5:
             return {'debug': True}
 
+        elif key.vk == libtcod.KEY_F3:
+            return {'timings': True}
+
         elif key.vk == libtcod.KEY_PAGEUP:
             return {'zoom': True}
 
@@ -766,8 +811,7 @@ class TextEntry:
 
     def get_text(self, max_length=30):
 
-        print(f"Getting some text (max {max_length} chars")
-        print(f'Using mask {self.mask}')
+        controller_logger.debug("Getting some text (max %d chars) using mask %s", max_length, self.mask)
 
         key = libtcod.Key()
         mouse = libtcod.Mouse()
@@ -781,9 +825,9 @@ class TextEntry:
                 typing = False
             elif len(text) < max_length and key.c in self.mask:
                 text += chr(key.c)
-                print(text)
+                controller_logger.debug("%s", text)
             elif key.vk == libtcod.KEY_BACKSPACE:
                 text = text[:-1]
-                print(text)
+                controller_logger.debug("%s", text)
 
         return text
@@ -0,0 +1,104 @@
+import collections
+import contextlib
+import json
+import time
+
+import numpy as np
+
+from roguelike.model.logs import controller_logger
+
+
+class FrameTimer():
+    """
+    Record how long each phase of a frame takes e.g. processing events, ticking the model, drawing views, etc.
+    Keeps a rolling window of the most recent durations for each phase so that we can see percentiles.
+    """
+    WINDOW_SIZE = 1000
+    PERCENTILES = (50, 95, 99)
+
+    # Bucket edges in milliseconds for the histograms that we dump to file
+    HISTOGRAM_BINS_MS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, float("inf"))
+
+    def __init__(self, window_size: int = WINDOW_SIZE):
+        self.enabled = False
+        self.window_size = window_size
+        self._samples = collections.OrderedDict()
+        self._starts = {}
+
+    def toggle(self, enabled: bool = None):
+        if enabled is None:
+            enabled = not self.enabled
+        self.enabled = enabled
+
+    def start(self, phase: str):
+        if self.enabled is True:
+            self._starts[phase] = time.perf_counter()
+
+    def stop(self, phase: str):
+        """
+        Stop timing a phase and record how long it took
+        :param phase: the name of the phase
+        :return: how long the phase took in seconds or None if we weren't timing it
+        """
+        start = self._starts.pop(phase, None)
+        if start is None:
+            return None
+
+        duration = time.perf_counter() - start
+        self.add_sample(phase, duration)
+        return duration
+
+    @contextlib.contextmanager
+    def phase(self, phase: str):
+        self.start(phase)
+        try:
+            yield
+        finally:
+            self.stop(phase)
+
+    def add_sample(self, phase: str, duration: float):
+        samples = self._samples.get(phase)
+        if samples is None:
+            samples = collections.deque(maxlen=self.window_size)
+            self._samples[phase] = samples
+        samples.append(duration)
+
+    @property
+    def phases(self) -> list:
+        return list(self._samples.keys())
+
+    def get_percentiles(self, phase: str) -> list:
+        """
+        Get the percentiles of the durations recorded for a phase
+        :param phase: the name of the phase
+        :return: list of durations in milliseconds for each of the PERCENTILES or None if we have no samples
+        """
+        samples = self._samples.get(phase)
+        if samples is None or len(samples) == 0:
+            return None
+
+        return list(np.percentile(np.array(samples) * 1000, FrameTimer.PERCENTILES))
+
+    def get_summary(self) -> dict:
+        summary = {}
+        for phase, samples in self._samples.items():
+            samples_ms = np.array(samples) * 1000
+            counts, edges = np.histogram(samples_ms, bins=FrameTimer.HISTOGRAM_BINS_MS)
+            summary[phase] = {"count": len(samples),
+                              "mean_ms": float(samples_ms.mean()),
+                              "max_ms": float(samples_ms.max())}
+            for p, value in zip(FrameTimer.PERCENTILES, self.get_percentiles(phase)):
+                summary[phase][f'p{p}_ms'] = float(value)
+            summary[phase]["histogram"] = {FrameTimer.bin_label(lo, hi): int(count)
+                                           for lo, hi, count in zip(edges[:-1], edges[1:], counts)}
+
+        return summary
+
+    @staticmethod
+    def bin_label(lo: float, hi: float) -> str:
+        return f'{lo:g}-{hi:g}ms' if hi != float("inf") else f'>{lo:g}ms'
+
+    def dump(self, file_name: str):
+        with open(file_name, "w") as timings_file:
+            json.dump(self.get_summary(), timings_file, indent=2)
+        controller_logger.info("Frame timings saved to %s", file_name)
@@ -0,0 +1,248 @@
+import random
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+import roguelike.model as model
+from roguelike.model.random_streams import RandomStreams
+
+
+class HeadlessController():
+    """
+    Drive the game Model without a tcod window or a View so that the engine can be soak tested
+    on machines that don't have a display.  Actions either come from a script or are picked at random.
+    """
+    ACTION_MOVE = "move"
+    ACTION_ATTACK = "attack"
+    ACTION_CAST = "cast"
+    ACTION_STAIRS = "stairs"
+    ACTION_PICKUP = "pickup"
+    ACTION_WAIT = "wait"
+
+    # How likely each action is to be picked when generating random actions
+    RANDOM_ACTION_WEIGHTS = {ACTION_MOVE: 80,
+                             ACTION_ATTACK: 6,
+                             ACTION_CAST: 4,
+                             ACTION_PICKUP: 4,
+                             ACTION_STAIRS: 2,
+                             ACTION_WAIT: 4}
+
+    MOVES = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+    GAME_FLOOR_WIDTH = 80
+    GAME_FLOOR_HEIGHT = 50
+
+    def __init__(self, name: str, seed: int = None, trace_memory: bool = False, prefetch_floors: bool = False):
+        # Properties
+        self.name = name
+        self.seed = seed
+        self.trace_memory = trace_memory
+        self.prefetch_floors = prefetch_floors
+
+        # Components
+        self.model = None
+        self.events = None
+
+        # Stats
+        self.turns = 0
+        self.event_count = 0
+        self.deaths = 0
+        self.floors_generated = 0
+        self.games = 0
+
+    def initialise(self):
+        # The seed is used for picking random actions as well as for the games
+        if self.seed is not None:
+            random.seed(self.seed)
+
+        self.new_game()
+
+    def new_game(self):
+        """
+        Start a new game with a new Model
+        """
+        # Count the floors that the old game generated
+        if self.model is not None:
+            self.floors_generated += len(self.model.floors)
+
+        # Each new game gets its own master seed derived from our seed
+        seed = RandomStreams.derive_seed(self.seed, "game", self.games) if self.seed is not None else None
+        self.games += 1
+
+        self.model = model.Model(self.name, prefetch_floors=self.prefetch_floors, seed=seed)
+        self.model.initialise(HeadlessController.GAME_FLOOR_WIDTH, HeadlessController.GAME_FLOOR_HEIGHT)
+        self.model.set_mode(model.Model.GAME_STATE_PLAYING)
+        self.events = self.model.events
+
+    def run(self, turns: int = 1000, actions=None) -> dict:
+        """
+        Run the Model for a number of turns
+        :param turns: how many turns do you want to run for?
+        :param actions: iterable of actions to perform.  Default is to pick random actions
+        :return: dictionary of stats about the run
+        """
+        if actions is None:
+            actions = self.random_actions()
+
+        if self.trace_memory is True:
+            tracemalloc.start()
+
+        start_time = time.perf_counter()
+
+        for action in actions:
+            if self.turns >= turns:
+                break
+
+            self.do_action(action)
+            self.model.tick()
+            self.process_events()
+            self.turns += 1
+
+        elapsed = time.perf_counter() - start_time
+
+        peak_traced_memory = None
+        if self.trace_memory is True:
+            current_memory, peak_traced_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        floors_generated = self.floors_generated + len(self.model.floors)
+
+        # tracemalloc slows down every allocation so label the throughput when it was running
+        prefix = "traced_" if self.trace_memory is True else ""
+
+        stats = {"turns": self.turns,
+                 "seconds": elapsed,
+                 prefix + "turns_per_second": self.turns / elapsed if elapsed > 0 else 0,
+                 "floors_generated": floors_generated,
+                 prefix + "floors_per_second": floors_generated / elapsed if elapsed > 0 else 0,
+                 "deaths": self.deaths,
+                 "events": self.event_count,
+                 "dungeon_level": self.model.dungeon_level,
+                 "peak_memory_mb": HeadlessController.get_peak_memory_mb()}
+
+        if peak_traced_memory is not None:
+            stats["peak_traced_memory_mb"] = peak_traced_memory / 1024 / 1024
+
+        stats["resident_floors"] = self.model.floors.resident_count
+        stats["resident_floor_mb"] = self.model.floors.resident_bytes / 1024 / 1024
+
+        prefetcher = self.model.floor_prefetcher
+        if prefetcher is not None:
+            stats["prefetch_hit_rate"] = prefetcher.hit_rate
+            stats["prefetch_waits"] = prefetcher.waits
+            if len(prefetcher.generation_times) > 0:
+                stats["floor_generation_seconds"] = sum(prefetcher.generation_times) / len(prefetcher.generation_times)
+
+        return stats
+
+    @staticmethod
+    def get_peak_memory_mb() -> float:
+        """
+        Get the peak resident memory of this process from the OS so that it can be measured without tracemalloc
+        :return: the peak memory in MB or None if the OS can't tell us
+        """
+        if resource is None:
+            return None
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        # Linux reports KB but macOS reports bytes
+        if sys.platform == "darwin":
+            peak /= 1024
+
+        return peak / 1024
+
+    def do_action(self, action):
+        """
+        Perform an action on the Model
+        :param action: tuple of action name and an optional argument e.g. ("move", (1, 0)) or ("cast", 1)
+        """
+        name, arg = action if isinstance(action, tuple) else (action, None)
+
+        if name == HeadlessController.ACTION_MOVE:
+            dx, dy = arg
+            self.model.move_player(dx, dy)
+        elif name == HeadlessController.ACTION_ATTACK:
+            self.model.attack()
+        elif name == HeadlessController.ACTION_CAST:
+            self.model.cast_spell(slot=arg if arg is not None else 1)
+        elif name == HeadlessController.ACTION_PICKUP:
+            self.model.take_item()
+        elif name == HeadlessController.ACTION_STAIRS:
+            self.take_stairs()
+        elif name == HeadlessController.ACTION_WAIT:
+            pass
+        else:
+            raise ValueError(f'Unknown action {action}')
+
+    def take_stairs(self):
+        """
+        Jump the player to the stairs down at the end of the current floor and take them
+        so that new floors keep getting generated
+        """
+        floor = self.model.current_floor
+        self.model.player.xy = floor.last_room.center
+        floor.move_player(0, 0)
+        self.model.take_stairs()
+
+    def process_events(self):
+        """
+        Drain the Model's event queue the same way that the Controller does
+        """
+        event = self.model.get_next_event()
+
+        while event is not None:
+            self.event_count += 1
+
+            if event.type == model.Event.STATE and event.name == model.Event.STATE_GAME_OVER:
+                self.deaths += 1
+                self.new_game()
+                break
+
+            self.model.process_event(event)
+            event = self.model.get_next_event()
+
+    def random_actions(self):
+        """
+        Generate an endless stream of random actions
+        """
+        names = list(HeadlessController.RANDOM_ACTION_WEIGHTS.keys())
+        weights = list(HeadlessController.RANDOM_ACTION_WEIGHTS.values())
+
+        while True:
+            name = random.choices(names, weights)[0]
+            if name == HeadlessController.ACTION_MOVE:
+                yield name, random.choice(HeadlessController.MOVES)
+            elif name == HeadlessController.ACTION_CAST:
+                yield name, random.randint(1, 4)
+            else:
+                yield name, None
+
+    @staticmethod
+    def load_script(file_name: str) -> list:
+        """
+        Load a list of actions from a text file with one action per line e.g. 'move 1 0', 'cast 2', 'attack'
+        :param file_name: the name of the script file
+        :return: list of actions
+        """
+        actions = []
+        with open(file_name) as script_file:
+            for line in script_file:
+                words = line.split("#")[0].split()
+                if len(words) == 0:
+                    continue
+
+                name, args = words[0].lower(), [int(word) for word in words[1:]]
+                if name == HeadlessController.ACTION_MOVE:
+                    actions.append((name, tuple(args)))
+                elif len(args) > 0:
+                    actions.append((name, args[0]))
+                else:
+                    actions.append((name, None))
+
+        return actions
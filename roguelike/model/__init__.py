@@ -3,6 +3,8 @@ from . model import Floor
 from . model import Room
 from . model import Event
 from . model import EventQueue
+from . model import FloorPrefetcher
+from . model import lerp_rgb
 from . entity_factory import Entity, Player, Fighter
 from . entity_factory import EntityFactory
 from . entity_factory import Inventory
@@ -1,43 +1,60 @@
-import pandas as pd
 from pathlib import Path
 import re
-import random
 import logging
+import functools
 
-def dnd_dice_text_to_roll(dice_text: str):
-    """
+from roguelike.model.data_pack import DataPack
+from roguelike.model.logs import dice_logger, data_logger
+from roguelike.model.random_streams import RandomStreams, get_stream
+
+# Regex for parsing DnD dice text e.g. 2d6+1
+DICE_NUMBER_PATTERN = re.compile(r'^\d+(?=d)')
+DICE_SIDES_PATTERN = re.compile(r'(?<=\dd)\d+')
+DICE_BONUS_PATTERN = re.compile(r'(?<=\d\+)\d+$')
 
-    :param dice_text: the DnD text representation of dice
-    :return: the result of rolling the dice combo
-    """
-    # Define regex for parsing the text
-    number_of_dice = re.compile(r'^\d+(?=d)')
-    dice_sides = re.compile(r'(?<=\dd)\d+')
-    extra_bonus = re.compile(r'(?<=\d\+)\d+$')
 
+@functools.lru_cache(maxsize=None)
+def parse_dice_text(dice_text: str) -> tuple:
+    """
+    Parse DnD dice text into its parts.  Results are cached so each dice expression only gets parsed once.
+    :param dice_text: the DnD text representation of dice e.g. 2d6+1
+    :return: tuple of number of dice, number of sides on each dice and the bonus
+    """
     # Use regex to extract the dice info from the text
-    r = number_of_dice.search(dice_text)
+    r = DICE_NUMBER_PATTERN.search(dice_text)
     assert r is not None, "Can't find number of dice"
     num_dice = int(r[0])
-    r = dice_sides.search(dice_text)
+    r = DICE_SIDES_PATTERN.search(dice_text)
     assert r is not None, "Can't find number of dice sides"
     num_dice_sides = int(r[0])
 
     # Bonus is optional
-    r = extra_bonus.search(dice_text)
+    r = DICE_BONUS_PATTERN.search(dice_text)
     if r is not None:
         bonus = int(r[0])
     else:
         bonus = 0
 
+    return num_dice, num_dice_sides, bonus
+
+
+def dnd_dice_text_to_roll(dice_text: str):
+    """
+
+    :param dice_text: the DnD text representation of dice
+    :return: the result of rolling the dice combo
+    """
+    num_dice, num_dice_sides, bonus = parse_dice_text(dice_text)
+
     # Now time to roll the dice!
     result = 0
+    rng = get_stream(RandomStreams.DICE)
 
     for i in range(num_dice):
-        result += random.randint(1, num_dice_sides)
+        result += rng.randint(1, num_dice_sides)
     result += bonus
 
-    print(f"Rolling {num_dice} x {num_dice_sides} sided dice + {bonus} = {result}")
+    dice_logger.debug("Rolling %d x %d sided dice + %d = %d", num_dice, num_dice_sides, bonus, result)
 
     return result
 
@@ -86,10 +103,11 @@ class CombatClassFactory:
         file_to_open = data_folder / "data" / file_name
 
         # Read in the csv file
-        CombatClassFactory.combat_classes = pd.read_csv(file_to_open)
+        CombatClassFactory.combat_classes = DataPack.read_csv(file_to_open)
         CombatClassFactory.combat_classes.set_index("Name", drop=True, inplace=True)
 
-        print(CombatClassFactory.combat_classes.tail(10))
+        if data_logger.isEnabledFor(logging.DEBUG):
+            data_logger.debug("Loaded %s:\n%s", file_name, CombatClassFactory.combat_classes.tail(10))
 
     @staticmethod
     def get_combat_class_by_name(name: str) -> CombatClass:
@@ -105,11 +123,11 @@ class CombatClassFactory:
                 hp = dnd_dice_text_to_roll(hp_dice)
                 e.update_property("Level1HP", hp)
 
-                print(f'{e.name}: rolled HP {hp_dice}={hp}')
+                dice_logger.debug("%s: rolled HP %s=%d", e.name, hp_dice, hp)
 
 
         else:
-            logging.warning(f"Can't find combat class {name} in factory!")
+            data_logger.warning("Can't find combat class %s in factory!", name)
 
         return e
 
@@ -151,36 +169,7 @@ class CombatEquipment:
         :param dice_text: the DnD text representation of dice
         :return: the result of rolling the dice combo
         """
-        # Define regex for parsing the text
-        number_of_dice = re.compile(r'^\d+(?=d)')
-        dice_sides = re.compile(r'(?<=\dd)\d+')
-        extra_bonus = re.compile(r'(?<=\d\+)\d+$')
-
-        # Use regex to extract the dice info from the text
-        r = number_of_dice.search(dice_text)
-        assert r is not None, "Can't find number of dice"
-        num_dice = int(r[0])
-        r = dice_sides.search(dice_text)
-        assert r is not None, "Can't find number of dice sides"
-        num_dice_sides = int(r[0])
-
-        # Bonus is optional
-        r = extra_bonus.search(dice_text)
-        if r is not None:
-            bonus = int(r[0])
-        else:
-            bonus = 0
-
-        # Now time to roll the dice!
-        result = 0
-
-        for i in range(num_dice):
-            result += random.randint(1,num_dice_sides)
-        result += bonus
-
-        print(f"Rolling {num_dice} x {num_dice_sides} sided dice + {bonus} = {result}")
-
-        return result
+        return dnd_dice_text_to_roll(dice_text)
 
 
 class CombatEquipmentFactory:
@@ -197,7 +186,7 @@ class CombatEquipmentFactory:
         file_to_open = data_folder / "data" / file_name
 
         # Read in the csv file
-        CombatEquipmentFactory.combat_equipment = pd.read_csv(file_to_open)
+        CombatEquipmentFactory.combat_equipment = DataPack.read_csv(file_to_open)
         CombatEquipmentFactory.combat_equipment.set_index("Name", drop=True, inplace=True)
 
     @staticmethod
@@ -208,7 +197,7 @@ class CombatEquipmentFactory:
             e = CombatEquipment(name=name, description=row["Description"], slot = row["Slot"])
             e.add_properties(row.iloc[2:].to_dict())
         else:
-            logging.info(f"Can't find combat equipment {name} in factory!")
+            data_logger.info("Can't find combat equipment %s in factory!", name)
 
         return e
 
@@ -218,7 +207,7 @@ class CombatEquipmentFactory:
         if eq is not None:
             dmg = eq.get_damage_roll()
         else:
-            print(f"{__class__}: Can't find equipment {equipment_name}")
+            data_logger.warning("%s: Can't find equipment %s", __class__, equipment_name)
             dmg = 0
 
         return dmg
@@ -0,0 +1,317 @@
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from roguelike.model.logs import data_logger
+
+
+class DataPack:
+    """
+    All of the csv files in the data folder compiled into one binary file.
+    Each table is stored as a set of raw numpy column arrays that are read straight out of a memory-mapped file
+    so loading the game data doesn't need to parse any csv text.  The pack records the modified time, size and
+    hash of every source file and is rebuilt automatically if any of them change.
+
+    File layout: MAGIC, version (uint32), header length (uint64), JSON header, column data
+    """
+
+    MAGIC = b"RLPK"
+    VERSION = 1
+    PREFIX = struct.Struct("<4sIQ")
+    ALIGNMENT = 16
+
+    DATA_FOLDER = Path(__file__).resolve().parent / "data"
+    PACK_FILE = DATA_FOLDER / "data.pack"
+
+    # Any read_csv options needed to parse specific source files
+    SOURCE_OPTIONS = {"ability_checks.csv": {"encoding": "latin1"}}
+
+    header = None
+    tables = {}
+    buffer = None
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def get_sources() -> list:
+        """
+        Get the names of all of the source csv files relative to the data folder
+        """
+        return sorted(path.relative_to(DataPack.DATA_FOLDER).as_posix()
+                      for path in DataPack.DATA_FOLDER.rglob("*.csv"))
+
+    @staticmethod
+    def get_source_details(source: str, with_hash: bool = True) -> dict:
+        path = DataPack.DATA_FOLDER / source
+        stat = path.stat()
+        details = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+        if with_hash is True:
+            details["sha1"] = hashlib.sha1(path.read_bytes()).hexdigest()
+        return details
+
+    @staticmethod
+    def is_stale(header: dict) -> bool:
+        """
+        Has the pack got the wrong version or has any source file been added, removed or changed since it was built?
+        If a file's modified time or size has changed then its hash is checked to see if its contents really changed.
+        :param header: the header of the pack that you want to check
+        :return: True if the pack needs to be rebuilt
+        """
+        if header is None or header.get("version") != DataPack.VERSION:
+            return True
+
+        sources = header["sources"]
+        if sorted(sources.keys()) != DataPack.get_sources():
+            return True
+
+        for source, built in sources.items():
+            current = DataPack.get_source_details(source, with_hash=False)
+            if current["mtime_ns"] == built["mtime_ns"] and current["size"] == built["size"]:
+                continue
+            if DataPack.get_source_details(source)["sha1"] != built["sha1"]:
+                data_logger.info("Data pack is out of date: %s has changed", source)
+                return True
+
+        return False
+
+    @staticmethod
+    def refresh_sources(header: dict) -> bool:
+        """
+        Update the modified time and size of any source files that have been touched without their contents changing
+        e.g. by a git checkout.  Only call this on a pack that is_stale() says is up to date.
+        :param header: the header of the pack
+        :return: True if any of the sources were updated
+        """
+        refreshed = False
+        for source, built in header["sources"].items():
+            current = DataPack.get_source_details(source, with_hash=False)
+            if current["mtime_ns"] != built["mtime_ns"] or current["size"] != built["size"]:
+                built.update(current)
+                refreshed = True
+        return refreshed
+
+    @staticmethod
+    def write_header(file_name, header: dict):
+        """
+        Rewrite the header of an existing pack keeping its column data as it is
+        :param file_name: the pack file
+        :param header: the new header
+        """
+        with open(file_name, "rb") as pack_file:
+            pack_file.seek(header["data_start"])
+            data = pack_file.read()
+
+        header = {key: value for key, value in header.items() if key != "data_start"}
+        header_bytes = json.dumps(header).encode("utf-8")
+        prefix = DataPack.PREFIX.pack(DataPack.MAGIC, DataPack.VERSION, len(header_bytes))
+
+        temp_file = Path(str(file_name) + ".tmp")
+        with open(temp_file, "wb") as pack_file:
+            pack_file.write(prefix)
+            pack_file.write(header_bytes)
+            data_start = pack_file.tell()
+            pack_file.write(b"\0" * (-data_start % DataPack.ALIGNMENT))
+            pack_file.write(data)
+        os.replace(temp_file, file_name)
+
+    @staticmethod
+    def encode_column(values: pd.Series):
+        """
+        Convert a column of a DataFrame into an array that can be stored in the pack
+        :param values: the column
+        :return: the array to store and a mask of the missing values for text columns
+        """
+        if values.dtype != object:
+            return values.to_numpy(), None
+
+        nulls = values.isna().to_numpy()
+        text = values.where(~nulls, "").astype(str).to_numpy()
+
+        return np.array(text, dtype=str), nulls
+
+    @staticmethod
+    def build(file_name=None):
+        """
+        Read every csv file in the data folder and write them all into a new data pack
+        :param file_name: where to write the pack.  Default is PACK_FILE
+        """
+        if file_name is None:
+            file_name = DataPack.PACK_FILE
+
+        header = {"version": DataPack.VERSION, "sources": {}, "tables": {}}
+        blobs = []
+        offset = 0
+
+        def add_blob(array: np.ndarray) -> dict:
+            nonlocal offset
+            array = np.ascontiguousarray(array)
+            padding = -offset % DataPack.ALIGNMENT
+            blobs.append(b"\0" * padding)
+            offset += padding
+            details = {"dtype": array.dtype.str, "offset": offset, "length": len(array)}
+            blobs.append(array.tobytes())
+            offset += array.nbytes
+            return details
+
+        for source in DataPack.get_sources():
+            header["sources"][source] = DataPack.get_source_details(source)
+            options = DataPack.SOURCE_OPTIONS.get(Path(source).name, {})
+            df = pd.read_csv(DataPack.DATA_FOLDER / source, **options)
+
+            columns = []
+            for name in df.columns:
+                values, nulls = DataPack.encode_column(df[name])
+                column = {"name": name, "data": add_blob(values)}
+                if nulls is not None:
+                    column["nulls"] = add_blob(nulls)
+                columns.append(column)
+
+            header["tables"][source] = {"rows": len(df), "columns": columns}
+
+        header_bytes = json.dumps(header).encode("utf-8")
+        prefix = DataPack.PREFIX.pack(DataPack.MAGIC, DataPack.VERSION, len(header_bytes))
+
+        # Write to a temporary file and then swap it in so that a half written pack is never loaded
+        temp_file = Path(str(file_name) + ".tmp")
+        with open(temp_file, "wb") as pack_file:
+            pack_file.write(prefix)
+            pack_file.write(header_bytes)
+            data_start = pack_file.tell()
+            pack_file.write(b"\0" * (-data_start % DataPack.ALIGNMENT))
+            for blob in blobs:
+                pack_file.write(blob)
+        os.replace(temp_file, file_name)
+
+        data_logger.info("Built data pack %s from %i files", file_name, len(header["sources"]))
+
+    @staticmethod
+    def read_header(pack_file) -> dict:
+        magic, version, header_length = DataPack.PREFIX.unpack(pack_file.read(DataPack.PREFIX.size))
+        if magic != DataPack.MAGIC or version != DataPack.VERSION:
+            return None
+        header = json.loads(pack_file.read(header_length).decode("utf-8"))
+        data_start = DataPack.PREFIX.size + header_length
+        header["data_start"] = data_start + (-data_start % DataPack.ALIGNMENT)
+        return header
+
+    @staticmethod
+    def load(file_name=None, rebuild: bool = True) -> bool:
+        """
+        Memory map the data pack so that read_csv() can get tables from it
+        :param file_name: the pack file.  Default is PACK_FILE
+        :param rebuild: rebuild the pack if it is missing or out of date?
+        :return: True if the pack was loaded
+        """
+        if file_name is None:
+            file_name = DataPack.PACK_FILE
+
+        DataPack.unload()
+
+        header = None
+        try:
+            with open(file_name, "rb") as pack_file:
+                header = DataPack.read_header(pack_file)
+        except (OSError, ValueError, struct.error) as err:
+            data_logger.info("Can't read data pack %s: %s", file_name, err)
+
+        if DataPack.is_stale(header) is True:
+            if rebuild is False:
+                return False
+            try:
+                DataPack.build(file_name)
+                with open(file_name, "rb") as pack_file:
+                    header = DataPack.read_header(pack_file)
+            except OSError as err:
+                data_logger.warning("Can't build data pack %s so loading csv files instead: %s", file_name, err)
+                return False
+
+        # Save the new modified times of any files that were only touched so that we don't hash them every time
+        elif DataPack.refresh_sources(header) is True:
+            try:
+                DataPack.write_header(file_name, header)
+                with open(file_name, "rb") as pack_file:
+                    header = DataPack.read_header(pack_file)
+                data_logger.info("Updated the modified times of the sources in data pack %s", file_name)
+            except OSError as err:
+                data_logger.warning("Can't update data pack %s: %s", file_name, err)
+
+        with open(file_name, "rb") as pack_file:
+            DataPack.buffer = mmap.mmap(pack_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        DataPack.header = header
+        DataPack.tables = header["tables"]
+
+        return True
+
+    @staticmethod
+    def unload():
+        DataPack.header = None
+        DataPack.tables = {}
+        DataPack.buffer = None
+
+    @staticmethod
+    def get_array(details: dict) -> np.ndarray:
+        return np.frombuffer(DataPack.buffer, dtype=np.dtype(details["dtype"]), count=details["length"],
+                             offset=DataPack.header["data_start"] + details["offset"])
+
+    @staticmethod
+    def get_table(source: str) -> pd.DataFrame:
+        """
+        Build a DataFrame from a table in the pack
+        :param source: the name of the csv file relative to the data folder e.g. themes/room_names.csv
+        :return: a new DataFrame with the same columns and dtypes as pd.read_csv() would give you
+        """
+        table = DataPack.tables[source]
+        data = {}
+        for column in table["columns"]:
+            values = DataPack.get_array(column["data"])
+            if "nulls" in column:
+                values = values.astype(object)
+                values[DataPack.get_array(column["nulls"])] = np.nan
+            else:
+                values = values.copy()
+            data[column["name"]] = values
+
+        return pd.DataFrame(data, index=pd.RangeIndex(table["rows"]))
+
+    @staticmethod
+    def read_csv(file_to_open, **kwargs) -> pd.DataFrame:
+        """
+        Drop in replacement for pd.read_csv() that gets the table from the data pack if it has been loaded
+        :param file_to_open: path of the csv file
+        :param kwargs: options passed on to pd.read_csv() if the file isn't in the pack.  Any SOURCE_OPTIONS for the
+        file are used by default.  Tables in the pack were read with their SOURCE_OPTIONS so other options are an error.
+        :return: DataFrame of the file's contents
+        """
+        options = dict(DataPack.SOURCE_OPTIONS.get(Path(file_to_open).name, {}))
+
+        if DataPack.buffer is not None:
+            try:
+                source = Path(file_to_open).resolve().relative_to(DataPack.DATA_FOLDER).as_posix()
+            except ValueError:
+                source = None
+            if source in DataPack.tables:
+                if any(options.get(name) != value for name, value in kwargs.items()):
+                    raise ValueError(f"Can't load {source} from the data pack with options {kwargs}. "
+                                     f"Add them to DataPack.SOURCE_OPTIONS instead.")
+                data_logger.debug("Loading %s from data pack", source)
+                return DataPack.get_table(source)
+
+        options.update(kwargs)
+        return pd.read_csv(file_to_open, **options)
+
+
+if __name__ == "__main__":
+    # Build the data pack e.g. python -m roguelike.model.data_pack
+    logging.basicConfig(level=logging.INFO)
+    DataPack.build()
+    DataPack.load(rebuild=False)
+    for source, table in DataPack.tables.items():
+        print(f'{source}: {table["rows"]} rows, {len(table["columns"])} columns')
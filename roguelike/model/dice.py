@@ -1,5 +1,7 @@
+import functools
 import re
-import random
+
+from roguelike.model.random_streams import RandomStreams, get_stream
 
 class DnD_Dice:
 
@@ -14,10 +16,18 @@ class DnD_Dice:
     def __str__(self):
         return self.dice_text
 
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def get_dice(dice_text: str):
+        """
+        Get the parsed dice for some dice text.  Cached so that each dice expression only gets parsed once.
+        """
+        return DnD_Dice(dice_text)
+
     @staticmethod
     def roll_dice_from_text(dice_text)->int:
 
-        return DnD_Dice(dice_text).roll()
+        return DnD_Dice.get_dice(dice_text).roll()
 
 
     def parse_dice_text(self, dice_text):
@@ -47,9 +57,10 @@ class DnD_Dice:
 
         # Now time to roll the dice!
         result = 0
+        rng = get_stream(RandomStreams.DICE)
 
         for i in range(self.num_dice):
-            result += random.randint(1, self.num_dice_sides)
+            result += rng.randint(1, self.num_dice_sides)
 
         result += self.bonus
 
@@ -1,4 +1,4 @@
-import copy
+import logging
 import math
 import operator
 
@@ -6,7 +6,10 @@ import numpy as np
 import tcod as libtcod
 
 from roguelike.model.combat import *
+from roguelike.model.data_pack import DataPack
+from roguelike.model.logs import items_logger, data_logger
 from roguelike.model.races import Race
+from roguelike.model.random_streams import RandomStreams, get_stream
 from roguelike.model.spells import SpellBook, Spell
 
 
@@ -16,7 +19,7 @@ def text_to_color(color_text: str) -> libtcod.color.Color:
     try:
         c = eval(f'libtcod.{color_text.lower()}')
         if isinstance(c, libtcod.color.Color) is False:
-            print("We didn't end up with a colour!")
+            data_logger.warning("We didn't end up with a colour from text %s!", color_text)
             c = None
     except AttributeError:
         #print(f"{color_text} is not a valid attribute")
@@ -25,14 +28,34 @@ def text_to_color(color_text: str) -> libtcod.color.Color:
     return c
 
 
+class PropertyBlock(dict):
+    """
+    Read-only dictionary of properties that is shared by all of the entities of the same type
+    """
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("PropertyBlock is read-only")
+
+    __setitem__ = __delitem__ = update = pop = popitem = clear = setdefault = _read_only
+
+    def __reduce__(self):
+        return PropertyBlock, (dict(self),)
+
+
 class Entity():
     """
     The Entity class is for holding information about ALL items in the game.
+    Entities of the same type share a read-only PropertyBlock and only hold the properties that they change.
 
     Attributes:
         STATE_xxxx (str):
 
     """
+    __slots__ = ("name", "description", "char", "category", "_state", "x", "y", "fg", "bg",
+                 "_type_properties", "_properties", "fighter", "combat_equipment", "_floor")
+
+    NO_PROPERTIES = PropertyBlock()
+
     STATE_INERT = "inert"
     STATE_ALIVE = "alive"
     STATE_DEAD = "dead"
@@ -69,12 +92,17 @@ class Entity():
         self.fg = fg
         self.bg = bg
 
-        self.properties = {}
+        # Properties shared with other entities of the same type and any properties that this entity has changed
+        self._type_properties = Entity.NO_PROPERTIES
+        self._properties = None
 
         # Components
         self.fighter = None
         self.combat_equipment = None
 
+        # The Floor that this Entity has been placed on (if any) so it can be told when we move
+        self._floor = None
+
     def __str__(self):
         return f"Name:{self.name}, char:'{self.char}', xyz: {self.x}/{self.y}/{self.z}, properties:{self.properties.keys()}"
 
@@ -93,28 +121,74 @@ class Entity():
 
     @xy.setter
     def xy(self, new_xy):
+        old_xy = (self.x, self.y)
         x, y = new_xy
         self.x = x
         self.y = y
 
+        # Let the Floor that we are on know that we have moved
+        if self._floor is not None:
+            self._floor.on_entity_moved(self, old_xy)
+
     @property
     def z(self):
         return self.get_property("Zorder")
 
+    @property
+    def properties(self) -> dict:
+        """
+        All of the Entity's properties i.e. the shared properties for its type with any changes applied
+        """
+        if self._properties is None:
+            return self._type_properties
+        return {**self._type_properties, **self._properties}
+
+    @properties.setter
+    def properties(self, new_properties: dict):
+        if isinstance(new_properties, PropertyBlock):
+            self._type_properties = new_properties
+            self._properties = None
+        else:
+            self._type_properties = Entity.NO_PROPERTIES
+            self._properties = dict(new_properties)
+
+        self._properties_changed()
+
     def add_properties(self, new_properties: dict):
-        self.properties.update(new_properties)
+        # Share a PropertyBlock if it is our first set of properties otherwise take our own copy
+        if isinstance(new_properties, PropertyBlock) and self._type_properties is Entity.NO_PROPERTIES \
+                and self._properties is None:
+            self._type_properties = new_properties
+        else:
+            if self._properties is None:
+                self._properties = {}
+            self._properties.update(new_properties)
+
         if self.get_property("IsEnemy") is True:
             self._state = Entity.STATE_ALIVE
 
+        self._properties_changed()
+
     def get_property(self, property_name: str):
-        return self.properties.get(property_name)
+        properties = self._properties
+        if properties is not None and property_name in properties:
+            return properties[property_name]
+        return self._type_properties.get(property_name)
 
     def set_property(self, property_name: str, new_value):
-        self.properties.update({property_name: new_value})
+        # Copy on write - only this entity sees the change
+        if self._properties is None:
+            self._properties = {}
+        self._properties[property_name] = new_value
+        self._properties_changed()
+
+    def _properties_changed(self):
+        # Let the Floor that we are on know that our properties have changed
+        if self._floor is not None:
+            self._floor.on_entity_changed(self)
 
     def move(self, dx: int, dy: int):
-        self.x += dx
-        self.y += dy
+        self.xy = (self.x + dx, self.y + dy)
 
     def distance_to_target(self, other_entity) -> float:
         return math.sqrt((self.x - other_entity.x) ** 2 + (self.y - other_entity.y) ** 2)
@@ -129,6 +203,8 @@ class Player(Entity):
         MAX_INVENTORY_ITEMS (int): What is the max allowable size of the player's inventory
 
     """
+    __slots__ = ("inventory",)
+
     MAX_INVENTORY_ITEMS = 20
 
     def __init__(self, name: str,
@@ -169,7 +245,7 @@ class Player(Entity):
         print(f'{self.name} at {self.xy}')
 
     def get_property(self, property_name: str):
-        value = self.properties.get(property_name)
+        value = super().get_property(property_name)
         if value is None:
             value = self.fighter.get_property(property_name)
         return value
@@ -186,7 +262,8 @@ class Player(Entity):
         self.y = new_entity.y
         self.fg = new_entity.fg
         self.bg = new_entity.bg
-        self.properties = copy.deepcopy(new_entity.properties)
+        self._type_properties = new_entity._type_properties
+        self._properties = dict(new_entity._properties) if new_entity._properties is not None else None
 
 
 
@@ -214,7 +291,7 @@ class Player(Entity):
             success = self.fighter.equip_item(new_item, slot)
 
         else:
-            print(f"{new_item.name} is not equippable")
+            items_logger.info("%s is not equippable", new_item.name)
             success = False
 
         return success
@@ -241,20 +318,7 @@ class Player(Entity):
         :return: the total value that your equipment and combat class provides for the specified stat
         """
 
-        # Get ALL of the stat totals from your equipment
-        totals = self.fighter.get_equipment_stat_totals([stat_name])
-
-        # Get the value of that your equipment provides
-        total = totals.get(stat_name)
-        if total is None:
-            total = 0
-
-        # Get thevalue of that stat that your combat class provides and add it to the total
-        v = self.fighter.combat_class.get_property(stat_name)
-        if v is not None:
-            total += v
-
-        return total
+        return self.fighter.get_stat_total(stat_name)
 
 
 class Fighter():
@@ -273,17 +337,23 @@ class Fighter():
         self.last_target = None
         self.combat_class = combat_class
         self.race = race
+
+        # Cache of stats that are derived from our combat class and equipment e.g. AC, attack bonuses, max HP
+        self._derived_stats = {}
+
         self.set_property("Level", 0)
         self.set_property("HP", self.get_max_HP())
         self.is_under_attack = False
 
         # Components
         self.equipment = {}
+        self._weapon_details = None
         Fighter.DEFAULT_WEAPON = EntityFactory.get_entity_by_name(Fighter.DEFAULT_WEAPON_NAME)
         self.spell_book = SpellBook(self.combat_class.name)
 
         if race is not None:
             self.combat_class.add_properties(race.properties, increment=True)
+            self.invalidate_derived_stats()
 
     @property
     def is_dead(self) -> bool:
@@ -307,6 +377,16 @@ class Fighter():
 
     @property
     def current_weapon_details(self) -> CombatEquipment:
+        # Use the details that we worked out last time unless our equipment has changed since
+        if self._weapon_details is None:
+            self._weapon_details = self.get_weapon_details()
+        return self._weapon_details
+
+    def get_weapon_details(self) -> CombatEquipment:
+        """
+        Get the combat details of the weapon that is currently equipped
+        :return: the CombatEquipment of the equipped weapon or a default attack if no weapon equipped
+        """
         eq = self.equipment.get(Fighter.WEAPON_SLOT)
 
         # Forge a default attack for the Fighter if no weapon equipped
@@ -332,6 +412,13 @@ class Fighter():
 
     def set_property(self, property_name: str, new_value: int, increment: bool = False):
         self.combat_class.update_property(property_name, new_value, increment)
+        self.invalidate_derived_stats()
+
+    def invalidate_derived_stats(self):
+        """
+        Throw away the derived stats that we have cached because our combat class or equipment has changed
+        """
+        self._derived_stats.clear()
 
     def get_property_modifier(self, property_name: str):
         """
@@ -339,14 +426,26 @@ class Fighter():
         :param property_name:
         :return:
         """
-        modifier = 0
-        property_value = self.combat_class.properties.get(property_name)
-        if property_value is not None:
-            modifier = math.floor((property_value - 10) / 2)
+        key = ("Modifier", property_name)
+        modifier = self._derived_stats.get(key)
+        if modifier is None:
+            modifier = 0
+            property_value = self.combat_class.properties.get(property_name)
+            if property_value is not None:
+                modifier = math.floor((property_value - 10) / 2)
+            self._derived_stats[key] = modifier
         return modifier
 
     def get_max_HP(self) -> int:
 
+        max_HP = self._derived_stats.get("MaxHP")
+        if max_HP is None:
+            max_HP = self.calculate_max_HP()
+            self._derived_stats["MaxHP"] = max_HP
+        return max_HP
+
+    def calculate_max_HP(self) -> int:
+
         # If this is a playable character then use their Constitution
         if self.combat_class.get_property("Playable") == True:
             con = self.get_property("CON")
@@ -362,6 +461,11 @@ class Fighter():
 
     def get_stat_total(self, stat_name: str) -> int:
 
+        key = ("Total", stat_name)
+        total = self._derived_stats.get(key)
+        if total is not None:
+            return total
+
         # Get the stat total from your equipment
         totals = self.get_equipment_stat_totals([stat_name])
         total = totals.get(stat_name)
@@ -375,6 +479,8 @@ class Fighter():
 
         # print(f'\tEquipment {stat_name} total = {total}')
 
+        self._derived_stats[key] = total
+
         return total
 
     def get_attack(self, ability: str = "STR"):
@@ -383,9 +489,13 @@ class Fighter():
         :param ability: the nme of the ability that you will be using to attack
         :return: current total attack power
         """
-        ability_modifier = self.get_property_modifier(ability)
-        attacker_level = self.get_property("Level")
-        attack = ability_modifier + math.floor(attacker_level / 2)
+        key = ("Attack", ability)
+        attack = self._derived_stats.get(key)
+        if attack is None:
+            ability_modifier = self.get_property_modifier(ability)
+            attacker_level = self.get_property("Level")
+            attack = ability_modifier + math.floor(attacker_level / 2)
+            self._derived_stats[key] = attack
 
         return attack
 
@@ -395,6 +505,15 @@ class Fighter():
         :param defense: the nme of the ability that you will be using to attack
         :return: current total defence value
         """
+        key = ("Defence", defense)
+        defence = self._derived_stats.get(key)
+        if defence is None:
+            defence = self.calculate_defence(defense)
+            self._derived_stats[key] = defence
+
+        return defence
+
+    def calculate_defence(self, defense: str = "AC"):
 
         # Special calculation for AC defense
         if defense == "AC":
@@ -466,6 +585,7 @@ class Fighter():
         """
         self.combat_class.update_property(property_name=ability_name, new_value=1, increment=True)
         self.set_property("Ability Points", -1, increment=True)
+        self.invalidate_derived_stats()
 
         # Recalculate our Max HP
         self.set_property("MaxHP", self.get_max_HP())
@@ -483,6 +603,10 @@ class Fighter():
 
         success = True
 
+        # Our weapon and derived stats might be about to change
+        self._weapon_details = None
+        self.invalidate_derived_stats()
+
         # If no new item is being equipped then remove existing item from the slot
         if new_item is None:
             if slot is not None and slot in self.equipment:
@@ -504,7 +628,7 @@ class Fighter():
                 if main_hand is not None:
                     main_eq = CombatEquipmentFactory.get_equipment_by_name(main_hand.name)
                     if main_eq.get_property("HANDS") == "2H":
-                        print(f'Can not equip offhand slot with 2H weapon {main_hand.name}')
+                        items_logger.info("Can not equip offhand slot with 2H weapon %s", main_hand.name)
                         success = False
 
             # Else If trying to equip a 2H weapon in main hand then unequip off hand item
@@ -527,6 +651,10 @@ class Fighter():
         for k in del_keys:
             del self.equipment[k]
 
+        if len(del_keys) > 0:
+            self._weapon_details = None
+            self.invalidate_derived_stats()
+
         return len(del_keys) > 0
 
     def is_equipped(self, item: Entity):
@@ -541,13 +669,18 @@ class Fighter():
         totals = {}
 
         for stat in stat_names:
-            totals[stat] = 0
-            for e in self.equipment.values():
-                eq = CombatEquipmentFactory.get_equipment_by_name(e.name)
-                if eq is not None:
-                    v = eq.get_property(stat)
-                    if v is not None:
-                        totals[stat] += v
+            key = ("Equipment", stat)
+            total = self._derived_stats.get(key)
+            if total is None:
+                total = 0
+                for e in self.equipment.values():
+                    eq = CombatEquipmentFactory.get_equipment_by_name(e.name)
+                    if eq is not None:
+                        v = eq.get_property(stat)
+                        if v is not None:
+                            total += v
+                self._derived_stats[key] = total
+            totals[stat] = total
 
         return totals
 
@@ -573,7 +706,7 @@ class Fighter():
         difficulty_value = success_levels[difficulty]
         ability_modifier = self.get_property_modifier(ability)
 
-        return random.randint(1,20) + ability_modifier >= difficulty_value
+        return get_stream(RandomStreams.CHECKS).randint(1,20) + ability_modifier >= difficulty_value
 
 
 
@@ -602,9 +735,48 @@ from pathlib import Path
 import pandas as pd
 
 
+class EntityPrototype:
+    """
+    The compiled template for a type of Entity that new entities get cloned from.
+    Built once when the entities are loaded so that spawning an Entity doesn't need to touch pandas.
+    """
+
+    def __init__(self, name: str, description: str, char: str, category: str, fg, bg, properties: dict):
+        self.name = name
+        self.description = description
+        self.char = char
+        self.category = category
+        self.fg = fg
+        self.bg = bg
+
+        # The properties are shared by every Entity created from this prototype
+        self.properties = PropertyBlock(properties)
+
+    def new_entity(self) -> Entity:
+        """
+        Create a new Entity from this prototype
+        :return: a new Entity that shares the prototype's properties
+        """
+        e = Entity(name=self.name,
+                   description=self.description,
+                   char=self.char,
+                   category=self.category,
+                   fg=self.fg,
+                   bg=self.bg)
+
+        e.add_properties(self.properties)
+
+        return e
+
+
 class EntityFactory:
     entities = None
 
+    # Prototypes compiled from the entities data by name and indexes of prototype names by category and property
+    prototypes = {}
+    category_index = {}
+    property_index = {}
+
     def __init__(self):
         pass
 
@@ -616,29 +788,43 @@ class EntityFactory:
         file_to_open = data_folder / "data" / file_name
 
         # Read in the csv file
-        EntityFactory.entities = pd.read_csv(file_to_open)
+        EntityFactory.entities = DataPack.read_csv(file_to_open)
         df = EntityFactory.entities
         df.set_index("Name", drop=True, inplace=True)
         df["IsTradable"] = EntityFactory.entities["Value"] > 0
 
-        print(df.head())
-        print(df.dtypes)
+        if data_logger.isEnabledFor(logging.DEBUG):
+            data_logger.debug("Loaded %s:\n%s\n%s", file_name, df.head(), df.dtypes)
+
+        EntityFactory.compile()
 
         # self.entities.set_index(self.entities.columns[0], drop=True, inplace=True)
 
+    @staticmethod
+    def compile():
+        """
+        Compile the loaded entities data into a prototype for each entity name and build the category index
+        """
+        EntityFactory.prototypes = {}
+        EntityFactory.category_index = {}
+        EntityFactory.property_index = {}
+
+        for index, row in EntityFactory.entities.iterrows():
+            prototype = EntityFactory.prototype_from_row(index, row)
+            EntityFactory.prototypes[index] = prototype
+            EntityFactory.category_index.setdefault(prototype.category, []).append(index)
+
     @staticmethod
     def get_entity_by_name(name: str) -> Entity:
 
         assert EntityFactory.entities is not None, "No entities have been loaded!"
 
         e = None
-        if name in list(EntityFactory.entities.index):
-            row = EntityFactory.entities.loc[name]
-
-            e = EntityFactory.entity_from_row(name, row)
-
+        prototype = EntityFactory.prototypes.get(name)
+        if prototype is not None:
+            e = prototype.new_entity()
         else:
-            print(f"Can't find entity {name} in factory!")
+            data_logger.info("Can't find entity %s in factory!", name)
 
         return e
 
@@ -646,53 +832,46 @@ class EntityFactory:
     def get_entities_by_property(property_name: str, property_value: bool = True) -> list:
 
         matches = []
-        df = EntityFactory.entities
 
-        if property_name in df.columns:
+        if property_name in EntityFactory.entities.columns:
 
-            q = f'{property_name} == {property_value}'
-            matched = df.query(q)
+            # Build the list of matching names the first time that we get asked for this property value
+            key = (property_name, property_value)
+            names = EntityFactory.property_index.get(key)
+            if names is None:
+                names = [name for name, prototype in EntityFactory.prototypes.items()
+                         if prototype.properties.get(property_name) == property_value]
+                EntityFactory.property_index[key] = names
 
-            for index, row in matched.iterrows():
-                e = EntityFactory.entity_from_row(index, row)
-                matches.append(e)
+            matches = [EntityFactory.prototypes[name].new_entity() for name in names]
         else:
-            print(f"Can't find property {property_name} in factory!")
+            data_logger.warning("Can't find property %s in factory!", property_name)
 
         return matches
 
     @staticmethod
     def get_entities_by_category(category_name: str) -> list:
 
-        matches = []
-        df = EntityFactory.entities
-
-        q = f"Category == '{category_name}'"
-        matched = df.query(q)
-
-        for index, row in matched.iterrows():
-            e = EntityFactory.entity_from_row(index, row)
-
-            matches.append(e)
+        names = EntityFactory.category_index.get(category_name, [])
+        matches = [EntityFactory.prototypes[name].new_entity() for name in names]
 
         return matches
 
     @staticmethod
-    def entity_from_row(index, row) -> Entity:
+    def prototype_from_row(index, row) -> EntityPrototype:
 
-        name = index
-        fg = text_to_color(row["FG"])
-        bg = text_to_color(row["BG"])
-        e = Entity(name=name,
-                   description=row["Description"],
-                   char=row["Char"],
-                   category=row["Category"],
-                   fg=fg,
-                   bg=bg)
+        return EntityPrototype(name=index,
+                               description=row["Description"],
+                               char=row["Char"],
+                               category=row["Category"],
+                               fg=text_to_color(row["FG"]),
+                               bg=text_to_color(row["BG"]),
+                               properties=row.iloc[5:].to_dict())
 
-        e.add_properties(row.iloc[5:].to_dict())
+    @staticmethod
+    def entity_from_row(index, row) -> Entity:
 
-        return e
+        return EntityFactory.prototype_from_row(index, row).new_entity()
 
 
 class Level():
@@ -725,7 +904,7 @@ class LevelFactory:
         file_to_open = data_folder / "data" / file_name
 
         # Read in the csv file
-        LevelFactory.levels = pd.read_csv(file_to_open)
+        LevelFactory.levels = DataPack.read_csv(file_to_open)
         df = LevelFactory.levels
         df.set_index("Level", drop=True, inplace=True)
 
@@ -917,7 +1096,7 @@ class Inventory:
                  (s * Inventory.COINS[Inventory.SILVER]) + \
                  (b * Inventory.COINS[Inventory.COPPER])
 
-        print(f'g{g}:s{s}:b{b}={result}')
+        items_logger.debug("g%d:s%d:b%d=%d", g, s, b, result)
 
         return result
 
@@ -980,7 +1159,7 @@ if __name__ == "__main__":
     names = {"Player", "Corpse", "Stairs Up", "Orc", "Dagger"}
 
     for name in names:
-        for c in range(random.randint(1, 3)):
+        for c in range(get_stream(RandomStreams.ITEMS).randint(1, 3)):
             new_enity = EntityFactory.get_entity_by_name(name)
             entities.append(new_enity)
 
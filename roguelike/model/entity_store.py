@@ -0,0 +1,164 @@
+import numpy as np
+
+
+class EntityStore:
+    """
+    Columnar copy of the entities on a Floor: numpy arrays of x, y, type id, Z order and property flag bits
+    with one slot per Entity.  The Floor keeps it in step as entities are added, moved, changed and removed
+    so that queries over thousands of entities can be done as vectorised masks rather than Python loops.
+    """
+
+    # Boolean entity properties that get a flag bit.  A flag is set if the property == True
+    FLAG_PROPERTIES = ("IsTransparent", "IsWalkable", "IsInteractable", "IsCollectable", "IsStackable",
+                       "IsEquippable", "IsCheckable", "IsEnemy", "IsTradable")
+    FLAG_BITS = {name: 1 << i for i, name in enumerate(FLAG_PROPERTIES)}
+
+    # Extra flag for entities that block light i.e. IsTransparent == False
+    FLAG_OPAQUE = 1 << len(FLAG_PROPERTIES)
+
+    INITIAL_CAPACITY = 64
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        self.x = np.zeros(capacity, dtype=np.int32)
+        self.y = np.zeros(capacity, dtype=np.int32)
+        self.type_id = np.full(capacity, -1, dtype=np.int32)
+        self.zorder = np.zeros(capacity, dtype=np.int16)
+        self.flags = np.zeros(capacity, dtype=np.uint16)
+
+        # Which slots are in use and the order that their entities were added in
+        self.active = np.zeros(capacity, dtype=bool)
+        self.order = np.zeros(capacity, dtype=np.int64)
+
+        self.entities = [None] * capacity
+        self.type_ids = {}
+        self._slots = {}
+        self._free_slots = list(range(capacity - 1, -1, -1))
+        self._counter = 0
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, entity):
+        return entity in self._slots
+
+    @property
+    def capacity(self) -> int:
+        return len(self.entities)
+
+    def _grow(self):
+        """
+        Double the size of all of the arrays
+        """
+        old_capacity = self.capacity
+        for name in ("x", "y", "type_id", "zorder", "flags", "active", "order"):
+            old = getattr(self, name)
+            new = np.zeros(old_capacity * 2, dtype=old.dtype)
+            new[:old_capacity] = old
+            setattr(self, name, new)
+        self.type_id[old_capacity:] = -1
+        self.entities.extend([None] * old_capacity)
+        self._free_slots.extend(range(old_capacity * 2 - 1, old_capacity - 1, -1))
+
+    def get_type_id(self, name: str) -> int:
+        type_id = self.type_ids.get(name)
+        if type_id is None:
+            type_id = len(self.type_ids)
+            self.type_ids[name] = type_id
+        return type_id
+
+    @staticmethod
+    def get_flags(entity) -> int:
+        """
+        Work out the flag bits for an Entity from its properties
+        :param entity: the Entity that you want the flags for
+        :return: the flag bits
+        """
+        flags = 0
+        for name, bit in EntityStore.FLAG_BITS.items():
+            if entity.get_property(name) == True:
+                flags |= bit
+        if entity.get_property("IsTransparent") == False:
+            flags |= EntityStore.FLAG_OPAQUE
+        return flags
+
+    def add(self, entity):
+        if entity in self._slots:
+            return
+
+        if len(self._free_slots) == 0:
+            self._grow()
+
+        slot = self._free_slots.pop()
+        self._slots[entity] = slot
+        self.entities[slot] = entity
+        self.active[slot] = True
+        self._counter += 1
+        self.order[slot] = self._counter
+        self.move(entity)
+        self.update(entity)
+
+    def remove(self, entity):
+        slot = self._slots.pop(entity, None)
+        if slot is not None:
+            self.entities[slot] = None
+            self.active[slot] = False
+            self.type_id[slot] = -1
+            self.flags[slot] = 0
+            self._free_slots.append(slot)
+
+    def move(self, entity):
+        """
+        Update the position of an Entity after it has moved
+        """
+        slot = self._slots.get(entity)
+        if slot is not None:
+            self.x[slot], self.y[slot] = entity.xy
+
+    def update(self, entity):
+        """
+        Update the type, Z order and flags of an Entity after its properties have changed
+        """
+        slot = self._slots.get(entity)
+        if slot is not None:
+            self.type_id[slot] = self.get_type_id(entity.name)
+            self.zorder[slot] = entity.get_property("Zorder") or 0
+            self.flags[slot] = EntityStore.get_flags(entity)
+
+    def get_mask(self, property_name: str = None, name: str = None, fov_map: np.ndarray = None) -> np.ndarray:
+        """
+        Get a mask of the slots with entities that match all of the specified conditions
+        :param property_name: only entities whose flag property == True
+        :param name: only entities with this name
+        :param fov_map: only entities that are in this FOV map
+        :return: boolean array with an element for each slot
+        """
+        mask = self.active.copy()
+
+        if property_name is not None:
+            mask &= (self.flags & EntityStore.FLAG_BITS[property_name]) > 0
+
+        if name is not None:
+            mask &= self.type_id == self.type_ids.get(name, -2)
+
+        if fov_map is not None:
+            w, h = fov_map.shape
+            in_bounds = (self.x >= 0) & (self.x < w) & (self.y >= 0) & (self.y < h)
+            mask &= in_bounds
+            in_fov = np.zeros_like(mask)
+            in_fov[in_bounds] = fov_map[self.x[in_bounds], self.y[in_bounds]]
+            mask &= in_fov
+
+        return mask
+
+    def get_slots(self, mask: np.ndarray) -> np.ndarray:
+        """
+        Get the slots selected by a mask in the order that their entities were added
+        """
+        slots = np.flatnonzero(mask)
+        return slots[np.argsort(self.order[slots], kind="stable")]
+
+    def select(self, mask: np.ndarray) -> list:
+        """
+        Get the entities selected by a mask in the order that they were added
+        """
+        return [self.entities[slot] for slot in self.get_slots(mask)]
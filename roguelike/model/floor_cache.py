@@ -0,0 +1,238 @@
+import collections
+import copyreg
+import pickle
+import shutil
+import tempfile
+import weakref
+from pathlib import Path
+import numpy as np
+
+from roguelike.model.logs import floor_logger
+
+
+class FloorPickler(pickle.Pickler):
+    """
+    Pickler that pages out one floor: large numpy arrays are saved as .npy files next to the pickle and
+    shared objects are saved by name
+    """
+
+    def __init__(self, file, floor_folder: Path, shared_ids: dict, floor):
+        """
+        :param file: the file to pickle the floor into
+        :param floor_folder: the folder to save the arrays in
+        :param shared_ids: dictionary of id() of each shared object to its name
+        :param floor: the floor that is being paged out
+        """
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.floor_folder = floor_folder
+        self.shared_ids = shared_ids
+        self.floor = floor
+        self.arrays = []
+
+    def persistent_id(self, obj):
+        if id(obj) in self.shared_ids:
+            return "shared", self.shared_ids[id(obj)]
+        if isinstance(obj, np.ndarray) and obj.dtype != object and obj.nbytes >= FloorCache.MIN_ARRAY_BYTES:
+            file_name = f'array_{len(self.arrays)}.npy'
+            np.save(self.floor_folder / file_name, obj)
+            self.arrays.append(file_name)
+            return "array", file_name
+        return None
+
+    def reducer_override(self, obj):
+        # Save the floor's boolean tile arrays unpacked so that they can be memory-mapped when it is paged in
+        if obj is self.floor:
+            return copyreg.__newobj__, (type(obj),), obj.get_state(pack_masks=False)
+        return NotImplemented
+
+
+class FloorCache:
+    """
+    List of every Floor in the game that only keeps the most recently used floors in memory.
+    Older floors are paged out to a temporary folder: their numpy arrays are saved as .npy files and everything
+    else is pickled.  When a paged out floor is needed again it is unpickled with its arrays memory-mapped
+    copy-on-write so only the parts of the arrays that are used get read back in.
+    """
+
+    # Arrays smaller than this are pickled with the rest of the floor
+    MIN_ARRAY_BYTES = 1024
+
+    def __init__(self, resident_limit: int = 3):
+        """
+        :param resident_limit: how many floors to keep in memory
+        """
+        self.resident_limit = resident_limit
+
+        # Objects that the floors refer to but which belong to the game e.g. the Player
+        # These are never paged out with a floor and are put back when the floor is reloaded
+        self.shared = {}
+
+        # Each floor is either a Floor object or the path of the folder that it was paged out to
+        self._floors = []
+
+        # Indexes of the resident floors in least recently used order
+        self._resident = collections.OrderedDict()
+
+        self._folder = None
+        self._cleanup = None
+        self._page_count = 0
+
+        # Stats
+        self.page_outs = 0
+        self.page_ins = 0
+
+    def __getstate__(self):
+        # Save all of the floors so that a saved game doesn't need the temporary folder
+        floors = [self.load(floor) if isinstance(floor, Path) else floor for floor in self._floors]
+        return {"resident_limit": self.resident_limit,
+                "shared": self.shared,
+                "floors": floors}
+
+    def __setstate__(self, state):
+        self.__init__(state["resident_limit"])
+        self.shared = state["shared"]
+
+        # Everything starts off resident and gets paged out the next time that a floor is used
+        self._floors = state["floors"]
+        for index in range(len(self._floors)):
+            self._resident[index] = True
+
+    def __len__(self):
+        return len(self._floors)
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += len(self._floors)
+
+        floor = self._floors[index]
+        if isinstance(floor, Path):
+            floor = self.page_in(index)
+
+        self._resident[index] = True
+        self._resident.move_to_end(index)
+        self.trim()
+
+        return floor
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def append(self, floor):
+        self._floors.append(floor)
+        index = len(self._floors) - 1
+        self._resident[index] = True
+        self.trim()
+
+    @property
+    def folder(self) -> Path:
+        # Create the temporary folder the first time that we need it and delete it when the cache goes away
+        if self._folder is None:
+            self._folder = Path(tempfile.mkdtemp(prefix="roguelike_floors_"))
+            self._cleanup = weakref.finalize(self, shutil.rmtree, str(self._folder), True)
+        return self._folder
+
+    def is_resident(self, index: int) -> bool:
+        return not isinstance(self._floors[index], Path)
+
+    def trim(self):
+        """
+        Page out the least recently used floors until we are within the resident limit
+        """
+        while len(self._resident) > self.resident_limit:
+            index, _ = self._resident.popitem(last=False)
+            self.page_out(index)
+
+    def page_out(self, index: int):
+        """
+        Save a floor to disk and drop it from memory
+        :param index: the index of the floor
+        """
+        floor = self._floors[index]
+        if isinstance(floor, Path):
+            return
+
+        self._page_count += 1
+        floor_folder = self.folder / f'floor_{index}_{self._page_count}'
+        floor_folder.mkdir()
+
+        shared_ids = {id(obj): name for name, obj in self.shared.items() if obj is not None}
+
+        with open(floor_folder / "floor.pkl", "wb") as floor_file:
+            pickler = FloorPickler(floor_file, floor_folder, shared_ids, floor)
+            pickler.dump(floor)
+        arrays = pickler.arrays
+
+        self._floors[index] = floor_folder
+        self.page_outs += 1
+
+        floor_logger.info("Paged out floor %i to %s (%i arrays).  %s", index + 1, floor_folder, len(arrays),
+                          ", ".join(self.get_stats()))
+
+    def load(self, floor_folder: Path):
+        """
+        Load a floor from the folder that it was paged out to with its arrays memory-mapped copy-on-write
+        :param floor_folder: the folder
+        :return: the floor
+        """
+        def persistent_load(pid):
+            kind, name = pid
+            if kind == "shared":
+                return self.shared[name]
+            return np.load(floor_folder / name, mmap_mode="c")
+
+        with open(floor_folder / "floor.pkl", "rb") as floor_file:
+            unpickler = pickle.Unpickler(floor_file)
+            unpickler.persistent_load = persistent_load
+            return unpickler.load()
+
+    def page_in(self, index: int):
+        """
+        Load a floor that was paged out back into memory
+        :param index: the index of the floor
+        :return: the reloaded floor
+        """
+        floor_folder = self._floors[index]
+        floor = self.load(floor_folder)
+
+        self._floors[index] = floor
+        self.page_ins += 1
+
+        # The arrays are still mapped so the files can't always be deleted yet
+        shutil.rmtree(floor_folder, ignore_errors=True)
+
+        floor_logger.info("Paged in floor %i", index + 1)
+
+        return floor
+
+    @staticmethod
+    def get_floor_bytes(floor) -> int:
+        """
+        How many bytes of numpy arrays does a floor have in memory?
+        """
+        return sum(floor.memory_usage().values())
+
+    @property
+    def resident_count(self) -> int:
+        return sum(1 for floor in self._floors if not isinstance(floor, Path))
+
+    @property
+    def resident_bytes(self) -> int:
+        return sum(FloorCache.get_floor_bytes(floor) for floor in self._floors if not isinstance(floor, Path))
+
+    @property
+    def paged_bytes(self) -> int:
+        total = 0
+        for floor in self._floors:
+            if isinstance(floor, Path):
+                total += sum(file.stat().st_size for file in floor.iterdir())
+        return total
+
+    def get_stats(self) -> list:
+        stats_text = []
+
+        stats_text.append(f"Resident floors={self.resident_count} of {len(self)}")
+        stats_text.append(f"Resident floor arrays={self.resident_bytes / 1024:0.0f}KB")
+        stats_text.append(f"Paged out={self.paged_bytes / 1024:0.0f}KB")
+
+        return stats_text
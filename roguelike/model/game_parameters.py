@@ -1,11 +1,36 @@
 
 from pathlib import Path
+import logging
+import sys
+import numpy as np
 import pandas as pd
 
+from roguelike.model.data_pack import DataPack
+from roguelike.model.logs import data_logger
+
 
 class GameParameters:
+    """
+    The curves that define how the game scales e.g. y = a*x + b + (x//d)*ad where x is the dungeon level.
+    When the parameters are loaded every curve is evaluated for every value of its input up to the table size
+    so looking up a parameter for the next floor is just an index into an array.
+    """
     parameters = None
 
+    # How many values of each input do we build lookup tables for?  Bigger inputs are calculated as needed
+    TABLE_SIZES = {"Level": 101, "XP": 50001}
+
+    # Compiled curves: one element per (Entity, Metric) parameter
+    keys = []
+    index = {}
+    scopes = []
+    inputs = []
+    coefficients = None
+
+    # Tables of y values by input name.  tables[x][xvalue] is an array of y for the parameters in columns[x]
+    tables = {}
+    columns = {}
+
     def __init__(self):
         pass
 
@@ -17,22 +42,83 @@ class GameParameters:
         file_to_open = data_folder / "data" / file_name
 
         # Read in the csv file
-        GameParameters.parameters = pd.read_csv(file_to_open)
+        GameParameters.parameters = DataPack.read_csv(file_to_open)
 
         df = GameParameters.parameters
         #GameParameters.parameters.dropna(inplace=True)
         df.set_index(["Entity", "Metric"], drop=True, inplace=True)
         mask = df["Template"].isna()
 
-        print(GameParameters.parameters)
+        if data_logger.isEnabledFor(logging.DEBUG):
+            data_logger.debug("Loaded %s:\n%s", file_name, GameParameters.parameters)
 
-        for index,row in df.loc[mask == False].iterrows():
-            template_name = row["Template"]
-            ename, metric = index
-            df.loc[(ename, metric), :] = df.loc[(template_name, metric)].values
+        # Copy the template rows over the rows that use them
+        templated = df.loc[mask == False]
+        template_rows = list(zip(templated["Template"], templated.index.get_level_values("Metric")))
+        if len(template_rows) > 0:
+            df.loc[templated.index, :] = df.loc[template_rows].values
 
         #print(df.head())
 
+        GameParameters.compile()
+
+    @staticmethod
+    def compile():
+        """
+        Compile the loaded parameters into arrays of curve coefficients and build the lookup table for each input
+        """
+        df = GameParameters.parameters
+
+        GameParameters.keys = list(df.index)
+        GameParameters.index = {key: i for i, key in enumerate(GameParameters.keys)}
+        GameParameters.scopes = list(df["Scope"])
+        GameParameters.inputs = list(df["x"])
+        GameParameters.coefficients = df[["a", "b", "d", "ad", "min", "max"]].to_numpy(dtype=np.float64)
+
+        GameParameters.tables = {}
+        GameParameters.columns = {}
+        for xname in sorted(set(GameParameters.inputs)):
+            columns = np.array([i for i, x in enumerate(GameParameters.inputs) if x == xname])
+            xvalues = np.arange(GameParameters.TABLE_SIZES.get(xname, 1))
+            GameParameters.columns[xname] = columns
+            GameParameters.tables[xname] = GameParameters.calculate(xvalues, columns)
+
+    @staticmethod
+    def calculate(xvalues, columns) -> np.ndarray:
+        """
+        Evaluate some of the parameter curves for some x values in one go
+        :param xvalues: array of x values
+        :param columns: array of the indexes of the parameters that you want to evaluate
+        :return: 2D array of y values with a row for each x value and a column for each parameter
+        """
+        x = np.asarray(xvalues).reshape(-1, 1)
+        a, b, d, ad, min_, max_ = GameParameters.coefficients[columns].T
+
+        # Calculate y = a*x + b + (x div d)*ad applying min and max constraints
+        result = a * x + b
+        result += (ad * (x // d))
+        result = np.minimum(np.maximum(result, min_), max_)
+
+        return result
+
+    @staticmethod
+    def get_values(inputs: dict) -> np.ndarray:
+        """
+        Get the value of every parameter for the specified inputs
+        :param inputs: dictionary of the value of each input e.g. {"Level": 3, "XP": 1200}
+        :return: array of values in the same order as GameParameters.keys
+        """
+        values = np.zeros(len(GameParameters.keys))
+
+        for xname, columns in GameParameters.columns.items():
+            xvalue = inputs[xname]
+            table = GameParameters.tables[xname]
+            if xvalue == int(xvalue) and 0 <= xvalue < len(table):
+                values[columns] = table[int(xvalue)]
+            else:
+                values[columns] = GameParameters.calculate([xvalue], columns)[0]
+
+        return values
 
     @staticmethod
     def get_parameter(yname : str, ymetric : str, xvalue : float) -> float:
@@ -42,49 +128,66 @@ class GameParameters:
         :param xvalue: value of the x parameter that is the input in y=f(x)
         :return: returns value of y
         """
-        assert (yname,ymetric) in GameParameters.parameters.index, f"Can't find '{yname} {ymetric}' in the game parameters!"
+        assert (yname,ymetric) in GameParameters.index, f"Can't find '{yname} {ymetric}' in the game parameters!"
 
-        row = GameParameters.parameters.loc[(yname, ymetric)]
+        i = GameParameters.index[(yname, ymetric)]
+        xname = GameParameters.inputs[i]
+        table = GameParameters.tables[xname]
 
-        yscope = row["Scope"]
-        xname = row["x"]
-        a = row["a"]
-        b = row["b"]
-        d = row["d"]
-        ad = row["ad"]
-        min_ = row["min"]
-        max_ = row["max"]
+        if xvalue == int(xvalue) and 0 <= xvalue < len(table):
+            column = int(np.searchsorted(GameParameters.columns[xname], i))
+            result = table[int(xvalue), column]
+        else:
+            result = GameParameters.calculate([xvalue], [i])[0, 0]
 
-        # Calculate y = a*x + b + (x div d)*ad applying min and max constraints
-        result = a*xvalue + b
-        result += (ad * (xvalue//d))
-        result = min(max(result, min_), max_)
-
-        print(f'When {xname}={xvalue} {yname} {ymetric}={result} per {yscope}')
+        data_logger.debug("When %s=%s %s %s=%s per %s", xname, xvalue, yname, ymetric, result,
+                          GameParameters.scopes[i])
 
-        return result
+        return float(result)
 
     @staticmethod
     def get_parameter_input(yname : str, ymetric : str) -> str:
 
-        assert (yname,ymetric) in GameParameters.parameters.index, f"Can't find '{yname} {ymetric}' in the game parameters!"
+        assert (yname,ymetric) in GameParameters.index, f"Can't find '{yname} {ymetric}' in the game parameters!"
 
-        row = GameParameters.parameters.loc[(yname, ymetric)]
-        return row["x"]
+        return GameParameters.inputs[GameParameters.index[(yname, ymetric)]]
 
     @staticmethod
     def get_parameter_scope(yname : str, ymetric : str) -> str:
 
-        assert (yname,ymetric) in GameParameters.parameters.index, f"Can't find '{yname} {ymetric}' in the game parameters!"
+        assert (yname,ymetric) in GameParameters.index, f"Can't find '{yname} {ymetric}' in the game parameters!"
 
-        row = GameParameters.parameters.loc[(yname, ymetric)]
-        return row["Scope"]
+        return GameParameters.scopes[GameParameters.index[(yname, ymetric)]]
 
     @staticmethod
-    def get_parameters_by_scope(scope_value : str) -> str:
-        q = f'Scope=="{scope_value}"'
-        results = GameParameters.parameters.query(q)
-        return results.index
+    def get_parameter_indexes_by_scope(scope_value : str) -> list:
+        return [i for i, scope in enumerate(GameParameters.scopes) if scope == scope_value]
+
+    @staticmethod
+    def get_parameters_by_scope(scope_value : str) -> list:
+        return [GameParameters.keys[i] for i in GameParameters.get_parameter_indexes_by_scope(scope_value)]
+
+    @staticmethod
+    def get_progression_table(xname: str = "Level", xvalues=None) -> pd.DataFrame:
+        """
+        Get the values of all of the parameters that use an input for a range of values of that input
+        e.g. how every Count and Probability changes as you go deeper into the dungeon
+        :param xname: the name of the input.  Default is Level
+        :param xvalues: the values of the input that you want.  Default is every value in the lookup table
+        :return: DataFrame with a row for each parameter and a column for each input value
+        """
+        columns = GameParameters.columns[xname]
+        if xvalues is None:
+            xvalues = np.arange(len(GameParameters.tables[xname]))
+
+        table = GameParameters.calculate(xvalues, columns)
+        index = pd.MultiIndex.from_tuples([GameParameters.keys[i] for i in columns], names=["Entity", "Metric"])
+
+        return pd.DataFrame(table.T, index=index, columns=list(xvalues))
+
+    @staticmethod
+    def dump_progression_table(file_name: str, xname: str = "Level", xvalues=None):
+        GameParameters.get_progression_table(xname, xvalues).to_csv(file_name)
 
 
 if __name__ == "__main__":
@@ -118,3 +221,7 @@ if __name__ == "__main__":
     #print(results)
     #print(list(results))
 
+    # Dump how every parameter changes with dungeon level e.g. python -m roguelike.model.game_parameters progression.csv
+    if len(sys.argv) > 1:
+        GameParameters.dump_progression_table(sys.argv[1], "Level", range(1, 51))
+
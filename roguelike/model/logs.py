@@ -0,0 +1,40 @@
+import logging
+import os
+
+# Loggers for each category of game diagnostics.
+# Everything below WARNING is off by default so the hot paths only pay for a level check.
+floor_logger = logging.getLogger("roguelike.floor")
+combat_logger = logging.getLogger("roguelike.combat")
+ai_logger = logging.getLogger("roguelike.ai")
+dice_logger = logging.getLogger("roguelike.dice")
+items_logger = logging.getLogger("roguelike.items")
+data_logger = logging.getLogger("roguelike.data")
+events_logger = logging.getLogger("roguelike.events")
+view_logger = logging.getLogger("roguelike.view")
+controller_logger = logging.getLogger("roguelike.controller")
+
+LOG_LEVEL_ENV = "ROGUELIKE_LOG_LEVEL"
+LOG_FORMAT = "%(levelname)s %(name)s: %(message)s"
+
+
+def configure_logging(level=None):
+    """
+    Set up logging for the game
+    :param level: the logging level name or number.  Default is to use the ROGUELIKE_LOG_LEVEL environment
+    variable or WARNING if that isn't set.  e.g. ROGUELIKE_LOG_LEVEL=DEBUG shows all of the game diagnostics
+    """
+    if level is None:
+        level = os.environ.get(LOG_LEVEL_ENV, "WARNING")
+
+    if isinstance(level, str):
+        level = level.upper()
+
+    logging.basicConfig(format=LOG_FORMAT)
+    logging.getLogger("roguelike").setLevel(level)
+
+
+def debug_events_enabled() -> bool:
+    """
+    Do we want the Model to create DEBUG events?  Only if the events logger is showing debug messages.
+    """
+    return events_logger.isEnabledFor(logging.DEBUG)
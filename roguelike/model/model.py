@@ -1,6 +1,9 @@
 import collections
-import copy
+import concurrent.futures
+import logging
+import multiprocessing
 import operator
+import time
 
 import numpy as np
 import pygame.rect as rect
@@ -10,8 +13,15 @@ from .combat import *
 from .entity_factory import Entity, Player, EntityFactory, Fighter, Level, LevelFactory
 from .races import Race, RaceFactory
 from .entity_factory import Inventory
+from .entity_store import EntityStore
+from .data_pack import DataPack
 from .events import Event
+from .floor_cache import FloorCache
 from .game_parameters import GameParameters
+from .random_streams import RandomStreams, get_stream
+from .logs import floor_logger, combat_logger, ai_logger, items_logger, data_logger, events_logger, \
+    debug_events_enabled, configure_logging
+from .scheduler import TurnScheduler
 from .spells import *
 from .themes import ThemeManager, Palette
 
@@ -31,15 +41,40 @@ def dim_rgb(rgb, dc: int):
         b = max(0, b - dc)
         return libtcod.Color(r, g, b)
     except Exception:
-        print(f'problem trying to dim {rgb}')
+        logging.error("problem trying to dim %s", rgb)
         assert False
 
 
+def lerp_rgb(rgb1, rgb2, coef) -> np.ndarray:
+    """
+    Linear interpolation between arrays of RGB colours that gives the same results as libtcod.color_lerp()
+    :param rgb1: the colours at coef=0.  A colour or an array of colours
+    :param rgb2: the colours at coef=1.  A colour or an array of colours
+    :param coef: the interpolation value or an array of values, one per colour
+    :return: uint8 array of the interpolated colours
+    """
+    rgb1 = np.asarray(rgb1, dtype=np.float32)
+    rgb2 = np.asarray(rgb2, dtype=np.float32)
+    coef = np.asarray(coef, dtype=np.float32)
+    if coef.ndim > 0:
+        coef = coef[:, np.newaxis]
+
+    # libtcod works in single precision floats and truncates the result
+    return (rgb1 + (rgb2 - rgb1) * coef).astype(np.uint8)
+
+
 class EventQueue():
-    def __init__(self):
+    def __init__(self, debug: bool = None):
         self.events = collections.deque()
 
+        # Are DEBUG events wanted?  They are dropped unless debug logging is turned on for events
+        self.debug = debug_events_enabled() if debug is None else debug
+
     def add_event(self, new_event: Event):
+        if new_event.type == Event.DEBUG:
+            if self.debug is False:
+                return
+            events_logger.debug("%s", new_event)
         self.events.append(new_event)
 
     def pop_event(self):
@@ -73,93 +108,91 @@ class Tunnel:
         self.end_bg = self.bg
 
         if direction is None:
-            self.direction = random.choice(Tunnel.DIRECTIONS)
+            self.direction = get_stream(RandomStreams.GENERATION).choice(Tunnel.DIRECTIONS)
         else:
             self.direction = direction
 
     def print(self):
         print(f'Tunnel running from {self.start_pos} to {self.end_pos} using {self.direction}')
 
-    def get_segments_thin(self) -> list:
-
-        segments = []
-
+    def get_corner(self) -> tuple:
+        """
+        Get the x of the vertical part and the y of the horizontal part of the tunnel
+        """
         start_x, start_y = self.start_pos
         end_x, end_y = self.end_pos
 
         hy = start_y if self.direction == Tunnel.DIRECTION_H_V else end_y
         vx = end_x if self.direction == Tunnel.DIRECTION_H_V else start_x
 
-        for x in range(min(start_x, end_x), max(start_x, end_x) + 1):
-            segments.append((x, hy))
-
-        for y in range(min(start_y, end_y), max(start_y, end_y) + 1):
-            segments.append((vx, y))
-
-        return segments
+        return vx, hy
 
-    def get_segments_fat(self) -> list:
-        segments = []
+    def get_segments_thin(self) -> np.ndarray:
 
         start_x, start_y = self.start_pos
         end_x, end_y = self.end_pos
+        vx, hy = self.get_corner()
 
-        hy = start_y if self.direction == Tunnel.DIRECTION_H_V else end_y
-        vx = end_x if self.direction == Tunnel.DIRECTION_H_V else start_x
+        xs = np.arange(min(start_x, end_x), max(start_x, end_x) + 1)
+        ys = np.arange(min(start_y, end_y), max(start_y, end_y) + 1)
 
-        for x in range(min(start_x, end_x), max(start_x, end_x) + 1):
-            segments.append((x, hy))
-            segments.append((x, hy + 1))
+        horizontal = np.column_stack((xs, np.full_like(xs, hy)))
+        vertical = np.column_stack((np.full_like(ys, vx), ys))
 
-        for y in range(min(start_y, end_y), max(start_y, end_y) + 1):
-            segments.append((vx, y))
-            segments.append((vx + 1, y))
+        return np.concatenate((horizontal, vertical))
 
-        return segments
+    def get_segments_fat(self) -> np.ndarray:
 
-    def get_segments_direct(self) -> list:
-
-        segments = []
-
-        cx, cy = self.start_pos
-        ex, ey = self.end_pos
+        start_x, start_y = self.start_pos
+        end_x, end_y = self.end_pos
+        vx, hy = self.get_corner()
 
-        segments.append((cx, cy))
+        xs = np.arange(min(start_x, end_x), max(start_x, end_x) + 1)
+        ys = np.arange(min(start_y, end_y), max(start_y, end_y) + 1)
 
-        while (cx, cy) != self.end_pos:
+        # Thin tunnel segments plus the tiles next to them
+        horizontal = np.column_stack((np.tile(xs, 2), np.repeat([hy, hy + 1], len(xs))))
+        vertical = np.column_stack((np.repeat([vx, vx + 1], len(ys)), np.tile(ys, 2)))
 
-            if cx < ex:
-                cx += 1
-            elif cx > ex:
-                cx -= 1
-            segments.append((cx, cy))
-            segments.append((cx, cy + 1))
-            segments.append((cx + 1, cy))
+        return np.concatenate((horizontal, vertical))
 
-            if cy < ey:
-                cy += 1
-            elif cy > ey:
-                cy -= 1
-            segments.append((cx, cy))
-            segments.append((cx, cy + 1))
-            segments.append((cx + 1, cy))
+    def get_segments_direct(self) -> np.ndarray:
 
-        return segments
+        start_x, start_y = self.start_pos
+        end_x, end_y = self.end_pos
+        dx = end_x - start_x
+        dy = end_y - start_y
 
-    def get_segments(self) -> list:
+        # Each step moves one tile across and then one tile down towards the end until we get there
+        steps = np.arange(1, max(abs(dx), abs(dy)) + 1)
+        xs = start_x + np.sign(dx) * np.minimum(steps, abs(dx))
+        ys = start_y + np.sign(dy) * np.minimum(steps, abs(dy))
+        previous_ys = start_y + np.sign(dy) * np.minimum(steps - 1, abs(dy))
 
-        fn = random.choice([self.get_segments_direct, self.get_segments_fat, self.get_segments_thin])
-        x = set(fn())
-        return list(x)
+        # Every position along the way is 3 tiles wide
+        positions = np.concatenate((np.column_stack((xs, previous_ys)), np.column_stack((xs, ys))))
+        offsets = np.array([(0, 0), (0, 1), (1, 0)])
+        segments = (positions[:, np.newaxis, :] + offsets).reshape(-1, 2)
 
-    def get_segment_distances(self, segment: tuple):
+        return np.concatenate((np.array([self.start_pos]), segments))
 
-        seg_x, seg_y = segment
-        start_x, start_y = self.start_pos
-        end_x, end_y = self.end_pos
+    def get_segments(self) -> np.ndarray:
+        """
+        Get the tiles that this tunnel runs through using a randomly chosen style
+        :return: array of unique (x, y) positions
+        """
+        rng = get_stream(RandomStreams.GENERATION)
+        fn = rng.choice([self.get_segments_direct, self.get_segments_fat, self.get_segments_thin])
+        return np.unique(fn(), axis=0)
 
-        l0_start = abs(seg_x - start_x) + abs(seg_y - start_y)
-        l0_end = abs(seg_x - end_x) + abs(seg_y - end_y)
+    def get_segment_distances(self, segments: np.ndarray) -> tuple:
+        """
+        Get the l0 distance from the start and end of the tunnel of every segment
+        :param segments: array of (x, y) positions
+        :return: arrays of the distances from the start and from the end
+        """
+        l0_start = np.abs(segments - self.start_pos).sum(axis=1)
+        l0_end = np.abs(segments - self.end_pos).sum(axis=1)
 
         return l0_start, l0_end
 
@@ -223,8 +256,10 @@ class Room:
         # Force the margin to be less than half of the smallest room dimension
         margin = int(min(margin, min(self.width, self.height) / 2))
 
-        return (self.x + random.randint(margin, self.width - margin - 1),
-                self.y + random.randint(margin, self.height - margin - 1))
+        rng = get_stream(RandomStreams.GENERATION)
+
+        return (self.x + rng.randint(margin, self.width - margin - 1),
+                self.y + rng.randint(margin, self.height - margin - 1))
 
     def print(self):
         print(f'Room {self.name} located at {self.rect}, colour:{self.bg}')
@@ -232,13 +267,28 @@ class Room:
 
 class Floor():
     EMPTY_TILE = "Empty"
+    FOV_CACHE_SIZE = 32
+
+    # Bots further away from the player than this are put to sleep
+    BOT_ACTIVITY_RADIUS = 12
+    # How many ticks does a bot stay awake for when something wakes it up?
+    BOT_WAKE_TICKS = 20
+    # How far away can a bot hear a noise?
+    NOISE_RADIUS = 8
+
+    # Boolean tile arrays that are bit-packed when a Floor is pickled e.g. saved or sent from a worker
+    PACKED_MASKS = ("walkable", "transparent", "explored", "fov_map")
 
     def __init__(self, name: str, width: int = 50, height: int = 50, level: int = 0, theme: str = "default",
-                 params=None):
+                 params=None, seed: int = None):
+
+        # Random number streams for generating and playing this floor
+        self.random_streams = RandomStreams(seed)
+        self.rng = self.random_streams.get_stream(RandomStreams.GENERATION)
 
         # Properties of this floor
         self.name = name
-        self.theme = random.choice(list(ThemeManager.available_themes))
+        self.theme = self.rng.choice(sorted(ThemeManager.available_themes))
         # self.theme = "Dungeon"
         self.room_colours = ThemeManager.get_room_colours_by_theme(self.theme)
 
@@ -277,14 +327,45 @@ class Floor():
         self.entities = []
         self.bots = []
 
+        # Index of the entities at each xy position on the floor, each list kept sorted by Z order
+        self._entity_index = {}
+
+        # Arrays of the entities' positions, types and flags for vectorised queries
+        self.entity_store = EntityStore()
+
         # Which parts of the floor are:-
         # - Walkable?
+        # - Transparent i.e. walkable and not blocked by a solid entity?
         # - Have already been explored?
         # - Are in the current FOV?
         # - Have a specific tile colour set?
         self.walkable = None
+        self.transparent = None
         self.explored = None
         self.fov_map = None
+        self._fov_dirty = False
+
+        # Which room is each tile in? (index into map_rooms or -1 if not in a room)
+        self.room_map = None
+
+        # Walking distance from each tile to the player that bots use to find their way
+        # and the scratch buffer of walking costs that it is calculated from.  Both are reused for every update.
+        # The terrain version only changes when something other than the player or a bot changes which tiles
+        # can be walked on so bots moving around don't cause the distances to be recalculated.
+        self._player_distance_map = None
+        self._player_distance_key = None
+        self._walk_cost = None
+        self._terrain_version = 0
+
+        # Turn order of the player and all of the bots that are awake
+        self.scheduler = TurnScheduler()
+        self._bot_activity_xy = None
+
+        # Cache of recently calculated FOV maps keyed on position, radius, algorithm and transparency version
+        self._transparency_version = 0
+        self._fov_cache = collections.OrderedDict()
+        self.fov_cache_hits = 0
+        self.fov_cache_misses = 0
         self.fov_radius = 7
         self.fov_radius2 = self.fov_radius ** 2
         self.floor_tile_colours = None
@@ -293,6 +374,41 @@ class Floor():
 
         self.events = None
 
+    def __getstate__(self):
+        return self.get_state(pack_masks=True)
+
+    def get_state(self, pack_masks: bool = True) -> dict:
+        """
+        Get the state of the Floor to pickle
+        :param pack_masks: bit-pack the boolean tile arrays?  FloorCache doesn't so that it can memory-map them
+        :return: dictionary of the Floor's attributes
+        """
+        state = self.__dict__.copy()
+
+        # Store the boolean tile arrays as 1 bit per tile rather than 1 byte
+        packed = {}
+        for name in Floor.PACKED_MASKS if pack_masks is True else ():
+            mask = state.get(name)
+            if isinstance(mask, np.ndarray):
+                packed[name] = (mask.shape, np.packbits(mask, axis=None))
+                state[name] = None
+        state["_packed_masks"] = packed
+
+        # Don't store caches and scratch buffers that can be rebuilt when they are next needed
+        state["_fov_cache"] = collections.OrderedDict()
+        state["_player_distance_map"] = None
+        state["_player_distance_key"] = None
+        state["_walk_cost"] = None
+
+        return state
+
+    def __setstate__(self, state):
+        packed = state.pop("_packed_masks", {})
+        self.__dict__.update(state)
+        for name, (shape, bits) in packed.items():
+            mask = np.unpackbits(bits, count=int(np.prod(shape))).view(bool).reshape(shape)
+            setattr(self, name, mask)
+
     def is_valid_xy(self, x: int, y: int):
         return x >= 0 and x < self.width and y >= 0 and y < self.height
 
@@ -302,6 +418,16 @@ class Floor():
         return self._revealed_entities
 
     def initialise(self, events: EventQueue):
+        """
+        Generate the Floor using its own random number streams so that the same seed always gives the same Floor
+        :param events: the event queue that the Floor object can use to report game events
+        """
+        with self.random_streams.using():
+            if self.name is None:
+                self.name = ThemeManager.get_random_history("Floor")
+            self.generate(events)
+
+    def generate(self, events: EventQueue):
         """
         Initialise the whole Floor object by:-
         - creating some random rooms on the Floor
@@ -321,8 +447,10 @@ class Floor():
 
         # Arrays to hold properties of each tile on the Floor
         self.walkable = None
+        self.transparent = None
         self.explored = None
         self.fov_map = None
+        self.room_map = None
         self.floor_tile_colours = None
         self._revealed_entities = []
         self._explored_rooms = set()
@@ -336,8 +464,7 @@ class Floor():
             if emax > 0 and eprob > 0:
                 room_entities_template.append((ename, eprob, emax))
 
-        print("*" * 40)
-        print(room_entities_template)
+        floor_logger.debug("Room entities template: %s", room_entities_template)
 
         # Build template that contains the list of entities that we want to add to the Floor
         # end their maximum count and probability of adding one
@@ -349,8 +476,7 @@ class Floor():
             if emax > 0 and eprob > 0:
                 floor_entities.append((ename, eprob, emax))
 
-        print("*" * 80)
-        print(floor_entities)
+        floor_logger.debug("Floor entities template: %s", floor_entities)
 
         # List of floor tile colours that can be randomly assigned to a Tunnel
         valid_tunnel_colours = ThemeManager.get_tunnel_colours_by_theme(self.theme)
@@ -370,14 +496,14 @@ class Floor():
                 room_names = ThemeManager.get_room_names_by_theme(self.theme)
 
             # Get a random room name and remove it from the list so it cannot be reused
-            room_name = random.choice(room_names)
+            room_name = self.rng.choice(room_names)
             room_names.remove(room_name)
             room_name = ThemeManager.get_random_history("Room")
 
             # Create a new room of random name, size and tile colour
             new_room = Room(name=room_name,
-                            w=random.randint(self.room_min_size, self.room_max_size),
-                            h=random.randint(self.room_min_size, self.room_max_size),
+                            w=self.rng.randint(self.room_min_size, self.room_max_size),
+                            h=self.rng.randint(self.room_min_size, self.room_max_size),
                             bg=ThemeManager.get_random_room_colour_by_theme(self.theme))
 
             # If we were able to add the room to the map...
@@ -391,7 +517,7 @@ class Floor():
                     self.add_entities_to_room(new_room, entities=room_entities)
 
                     # Create a tunnel connecting back to the previous room
-                    random_tunnel_colour = random.choice(valid_tunnel_colours)
+                    random_tunnel_colour = self.rng.choice(valid_tunnel_colours)
                     new_tunnel = Tunnel(start_pos=self.last_room.center,
                                         end_pos=new_room.center,
                                         bg=random_tunnel_colour)
@@ -405,7 +531,7 @@ class Floor():
                 self.last_room = new_room
 
             else:
-                print('\t**Couldnt add room so skipping and moving on')
+                floor_logger.debug("Couldn't add room so skipping and moving on")
 
         # redefine first and last rooms
         self.last_room = self.map_rooms[-1]
@@ -420,9 +546,9 @@ class Floor():
         self.build_floor_map()
 
         # Randomly use cavern floor layout
-        if random.randint(0, 10) > 8 and self.level > 3:
-            self.build_floor_cave(tile_colour=ThemeManager.get_random_room_colour_by_theme(self.theme))
+        if self.rng.randint(0, 10) > 8 and self.level > 3:
             self.map_rooms = [self.first_room, self.last_room]
+            self.build_floor_cave(tile_colour=ThemeManager.get_random_room_colour_by_theme(self.theme))
 
         self.entities_added = len(self.entities)
 
@@ -439,6 +565,8 @@ class Floor():
 
         target = self.auto_target()
         print(f'auto-target={target}')
+        print(f'Active bots: {self.active_bot_count} of {len(self.bots)}')
+        print(f'FOV cache: hits={self.fov_cache_hits}, misses={self.fov_cache_misses}')
 
     def get_stats(self):
         stats_text = []
@@ -457,6 +585,24 @@ class Floor():
 
         return stats_text
 
+    def memory_usage(self) -> dict:
+        """
+        How many bytes of numpy arrays does this Floor have in memory?
+        Memory-mapped arrays are not counted because they are backed by a file.
+        :return: dictionary of array name to bytes with the cached FOV maps totalled under 'fov_cache'
+        """
+        usage = {}
+
+        objects = {"": self.__dict__, "entity_store.": self.entity_store.__dict__}
+        for prefix, attributes in objects.items():
+            for name, value in attributes.items():
+                if isinstance(value, np.ndarray) and getattr(value, "filename", None) is None:
+                    usage[prefix + name.lstrip("_")] = value.nbytes
+
+        usage["fov_cache"] = sum(fov.nbytes for fov in self._fov_cache.values())
+
+        return usage
+
     def get_XP_reward(self) -> int:
         reward = 0
 
@@ -489,7 +635,7 @@ class Floor():
         # Point all bots at the player!!!!
         for bot in self.bots:
             bot.set_instructions(new_target=self.player)
-            print(bot)
+            ai_logger.debug("%s", bot)
 
     def add_entities_to_room(self, room: Room, entities):
         """
@@ -513,14 +659,14 @@ class Floor():
             if e is not None:
                 template = e.get_property("Template")
                 if template is not None:
-                    print(f'Using entity template {template} for {e.description}')
+                    floor_logger.debug("Using entity template %s for %s", template, e.description)
                     # TBC to lookup template tprob and tcount !!!!
             else:
                 continue
 
             # If the entity is an enemy and we have already hit the XP cap then loop to next entity
             if e.get_property("IsEnemy") == True and enemy_xp_total >= self.room_xp_cap:
-                print(f'XP at {enemy_xp_total} which exceeds cap of {self.room_xp_cap}')
+                floor_logger.debug("XP at %s which exceeds cap of %s", enemy_xp_total, self.room_xp_cap)
                 continue
 
             # If it is solid and it doesn't move...
@@ -533,10 +679,10 @@ class Floor():
                 margin = 0
 
             # Try an create a random number of entities up to the max allowable...
-            for count in range(random.randint(1, emax)):
+            for count in range(self.rng.randint(1, emax)):
 
                 # I random number less than our probability of creating this entity...
-                if random.randint(1, 100) < eprob:
+                if self.rng.randint(1, 100) < eprob:
 
                     # Find a random spot in the room
                     rx, ry = room.get_random_pos(margin=margin)
@@ -546,8 +692,7 @@ class Floor():
 
                         # Place a new entity at this location
                         new_entity = EntityFactory.get_entity_by_name(ename)
-                        new_entity.xy = rx, ry
-                        self.entities.append(new_entity)
+                        self.add_entity(new_entity, (rx, ry))
 
                         # if the entity is an enemy then create an AI bot to control it
                         if new_entity.get_property("IsEnemy") == True:
@@ -581,7 +726,7 @@ class Floor():
 
         # Add different stuff to random rooms across the floor
         for ename, eprob, emax in entities:
-            print(f'Attempting to add {emax} {ename}s with prob={eprob}')
+            floor_logger.debug("Attempting to add %s %ss with prob=%s", emax, ename, eprob)
 
             # If nothing to add for this entity loop to the next one
             if emax == 0 or eprob == 0:
@@ -595,7 +740,7 @@ class Floor():
             if e.get_property("IsWalkable") == False and \
                     e.get_property("IsEnemy") == False:
                 margin = 1
-                print(f"margin = 1 for {e.name}:{e.description}")
+                floor_logger.debug("margin = 1 for %s:%s", e.name, e.description)
             else:
                 margin = 0
 
@@ -604,10 +749,10 @@ class Floor():
             for i in range(emax):
 
                 # If random number less than our probability of creating this entity...
-                if random.randint(1, 100) < eprob:
+                if self.rng.randint(1, 100) < eprob:
 
                     # pick a random room and a random position in the room
-                    room = random.choice(available_rooms)
+                    room = self.rng.choice(available_rooms)
 
                     if e.name == "Shop":
                         room = self.first_room
@@ -620,12 +765,11 @@ class Floor():
                         # Add a new entity to the floor at this location
                         new_entity = EntityFactory.get_entity_by_name(ename)
                         if new_entity is None:
-                            print(f"Couldn't create entity by name of {ename}")
+                            floor_logger.warning("Couldn't create entity by name of %s", ename)
                             continue
-                        new_entity.xy = rx, ry
-                        self.entities.append(new_entity)
+                        self.add_entity(new_entity, (rx, ry))
 
-                        print(f'\t++ Added {new_entity.name} to room {room.name}')
+                        floor_logger.debug("Added %s to room %s", new_entity.name, room.name)
 
                         # Don't use this room again
                         # Can't delete while iterating!!!!!
@@ -635,22 +779,20 @@ class Floor():
         if self.level > 1:
             ename = "Up Stairs"
             new_entity = EntityFactory.get_entity_by_name(ename)
-            new_entity.xy = self.first_room.center
             e = self.get_entity_at_pos(self.last_room.center)
             # Replace anything that is already there!
             if e is not None:
                 self.remove_entity(e)
-            self.entities.append(new_entity)
+            self.add_entity(new_entity, self.first_room.center)
 
         # In the last room add some stairs to the next level down
         ename = "Down Stairs"
         new_entity = EntityFactory.get_entity_by_name(ename)
-        new_entity.xy = self.last_room.center
         e = self.get_entity_at_pos(self.last_room.center)
         # Replace anything that is already there!
         if e is not None:
             self.remove_entity(e)
-        self.entities.append(new_entity)
+        self.add_entity(new_entity, self.last_room.center)
 
     def move_player(self, dx, dy, relative: bool = True) -> bool:
         """
@@ -679,8 +821,9 @@ class Floor():
                           description=f"You found {e.description}!"))
 
             # See if we changed rooms/tunnels
-            if self.current_room != self.get_current_room():
-                self.current_room = self.get_current_room()
+            new_room = self.get_current_room()
+            if self.current_room != new_room:
+                self.current_room = new_room
                 if self.current_room is None:
                     room_name = "a tunnel"
                 else:
@@ -743,7 +886,7 @@ class Floor():
         newy = entity.y + dy
 
         # If the destination is a valid path on the map...
-        if self.walkable[newx, newy] > 0:
+        if self.is_walkable(newx, newy):
 
             # And no solid entity is blocking the way...
             e = self.get_entity_at_pos((newx, newy))
@@ -770,24 +913,141 @@ class Floor():
         :param pos: the xy position that you want to check
         :return: the Entity at the specified position if one was found otherwise None.  if more then one found sort by Z order
         """
-        found = []
-        for e in self.entities:
-            if e.xy == pos and (include_player is True or e is not self.player):
-                found.append(e)
+        found = self._entity_index.get(tuple(pos))
 
-        if len(found) > 0:
-            found.sort(key=lambda x: x.get_property("Zorder"), reverse=False)
-            e = found[0]
-        else:
-            e = None
+        if found is not None:
+            for e in found:
+                if include_player is True or e is not self.player:
+                    return e
+
+        return None
+
+    def get_entities_at_pos(self, pos: tuple) -> list:
+        """
+        Get all of the entities at a specified xy position on the Floor
+        :param pos: the xy position that you want to check
+        :return: list of Entity objects at the position sorted by Z order
+        """
+        return list(self._entity_index.get(tuple(pos), ()))
+
+    def add_entity(self, new_entity: Entity, xy: tuple = None):
+        """
+        Add an Entity to the Floor and keep track of its position
+        :param new_entity: the Entity that you want to add
+        :param xy: where to place the new Entity.  Default is None which means use its current position
+        """
+        if xy is not None:
+            new_entity.xy = xy
 
-        return e
+        self.entities.append(new_entity)
+        new_entity._floor = self
+        self.entity_store.add(new_entity)
+        self._index_entity(new_entity, new_entity.xy)
 
     def remove_entity(self, old_entity: Entity):
-        if old_entity in self.entities:
+        if old_entity in self.entity_store:
             self.entities.remove(old_entity)
+            self.entity_store.remove(old_entity)
+            self._unindex_entity(old_entity, old_entity.xy)
+            old_entity._floor = None
         else:
-            print(f"Couldn't find {old_entity.name} on this floor!")
+            floor_logger.warning("Couldn't find %s on this floor!", old_entity.name)
+
+    def on_entity_moved(self, entity: Entity, old_xy: tuple):
+        """
+        Update the position index when an Entity on this Floor moves
+        :param entity: the Entity that moved
+        :param old_xy: where the Entity was before it moved
+        """
+        self.entity_store.move(entity)
+        self._unindex_entity(entity, old_xy)
+        self._index_entity(entity, entity.xy)
+
+    def on_entity_changed(self, entity: Entity):
+        """
+        Update the entity store and transparency when the properties of an Entity on this Floor change
+        :param entity: the Entity that changed
+        """
+        self.entity_store.update(entity)
+        self._update_transparency(entity.xy)
+        self._update_terrain(entity)
+
+    def _index_entity(self, entity: Entity, xy: tuple):
+        found = self._entity_index.get(xy)
+        if found is None:
+            self._entity_index[xy] = [entity]
+        else:
+            found.append(entity)
+            found.sort(key=lambda e: e.get_property("Zorder"))
+
+        self._update_transparency(xy)
+        self._update_terrain(entity)
+
+    def _unindex_entity(self, entity: Entity, xy: tuple):
+        found = self._entity_index.get(xy)
+        if found is not None and entity in found:
+            found.remove(entity)
+            if len(found) == 0:
+                del self._entity_index[xy]
+
+        self._update_transparency(xy)
+        self._update_terrain(entity)
+
+    def _update_terrain(self, entity: Entity):
+        """
+        Something has happened to an Entity.  If it isn't the player or a bot then it might have changed
+        which tiles bots can walk through.
+        """
+        if entity is not self.player and entity.get_property("IsEnemy") != True:
+            self._terrain_version += 1
+
+    def _update_transparency(self, xy: tuple):
+        """
+        Recalculate whether a single tile is transparent based on the entities that are currently on it.
+        If it changed then flag that the FOV needs to be recalculated.
+        :param xy: the position of the tile that you want to update
+        """
+        # Nothing to do if we haven't built the map yet
+        if self.transparent is None:
+            return
+
+        x, y = xy
+        if self.is_valid_xy(x, y) is False:
+            return
+
+        is_transparent = bool(self.walkable[x, y])
+        if is_transparent is True:
+            for e in self._entity_index.get(xy, ()):
+                if e.get_property("IsTransparent") == False:
+                    is_transparent = False
+                    break
+
+        if is_transparent != self.transparent[x, y]:
+            self.transparent[x, y] = is_transparent
+            self._transparency_changed()
+
+    def build_transparency_map(self):
+        """
+        Build the array of tiles that light can pass through i.e. walkable tiles that
+        don't have a solid entity on them
+        """
+        self.transparent = self.walkable.copy()
+
+        store = self.entity_store
+        opaque = store.active & ((store.flags & EntityStore.FLAG_OPAQUE) > 0) & \
+                 (store.x >= 0) & (store.x < self.width) & (store.y >= 0) & (store.y < self.height)
+        self.transparent[store.x[opaque], store.y[opaque]] = False
+
+        self._transparency_changed()
+        self._terrain_version += 1
+
+    def _transparency_changed(self):
+        """
+        The transparency grid has changed so any FOV that we have calculated is now out of date
+        """
+        self._transparency_version += 1
+        self._fov_cache.clear()
+        self._fov_dirty = True
 
     def swap_entity(self, old_entity: Entity, new_entity: Entity = None):
         """
@@ -795,27 +1055,31 @@ class Floor():
         :param old_entity: the entity that you want to swap out
         :param new_entity: the new entity that you want to replace it with. Default is None which means remove the old entity
         """
-        if old_entity in self.entities:
+        if old_entity in self.entity_store:
             if new_entity is not None and new_entity.name != Floor.EMPTY_TILE:
-                new_entity.xy = old_entity.xy
-                self.entities.append(new_entity)
-            self.entities.remove(old_entity)
+                self.add_entity(new_entity, old_entity.xy)
+            self.remove_entity(old_entity)
         else:
-            print(f"Couldn't find {old_entity.name} on this floor!")
+            floor_logger.warning("Couldn't find %s on this floor!", old_entity.name)
 
     def auto_target(self, index: int = 0) -> Entity:
 
         target = None
-        targets = []
-        fov = self.get_fov_cells()
-        targets = [(e, e.distance_to_target(self.player)) for e in self.entities if
-                   e.get_property("IsEnemy") == True and e.xy in fov]
+        if self.fov_map is None:
+            return target
+
+        # Find the enemies in the FOV and sort them by distance from the player
+        store = self.entity_store
+        slots = store.get_slots(store.get_mask(property_name="IsEnemy", fov_map=self.fov_map))
+        px, py = self.player.xy
+        distances = np.sqrt((store.x[slots] - px) ** 2 + (store.y[slots] - py) ** 2)
+        by_distance = np.argsort(distances, kind="stable")
 
-        if len(targets) > 0:
-            targets.sort(key=lambda x: x[1])
-            target = targets[index][0]
+        if len(slots) > 0:
+            target = store.entities[slots[by_distance[index]]]
 
-        print(targets)
+        if combat_logger.isEnabledFor(logging.DEBUG):
+            combat_logger.debug("Targets: %s", [(store.entities[slots[i]], distances[i]) for i in by_distance])
 
         return target
 
@@ -857,10 +1121,11 @@ class Floor():
                       description=f"{target.description.capitalize()} is out of range for {weapon.description}"))
             return False
 
-        self.events.add_event(
-            Event(type=Event.DEBUG,
-                  name=Event.ACTION_ATTACK,
-                  description=f"{attacker.description} attacks {target.description}"))
+        if self.events.debug is True:
+            self.events.add_event(
+                Event(type=Event.DEBUG,
+                      name=Event.ACTION_ATTACK,
+                      description=f"{attacker.description} attacks {target.description}"))
 
 
         # What are the attack and defence abilities for this weapon?
@@ -868,14 +1133,18 @@ class Floor():
         defence_ability = weapon.get_property("DEF")
 
         # Roll a 20 sided dice and add to attack power
-        attack = attacker.fighter.get_attack(attack_ability) + random.randint(1, 20)
+        rng = self.random_streams.get_stream(RandomStreams.COMBAT)
+        attack = attacker.fighter.get_attack(attack_ability) + rng.randint(1, 20)
 
         # Calculate the target's ability defence
         defence = target.fighter.get_defence(defence_ability)
 
-        print(f'{attacker.name} using weapon {weapon.description} ({attack_ability} vs {defence_ability})')
-        print(f'{attacker.name} ATK ({attack_ability}={attack}) vs ({defence_ability}={defence}) DEF of {target.name}')
-        print(f'Defender HP={target.fighter.combat_class.get_property("HP")}')
+        if combat_logger.isEnabledFor(logging.DEBUG):
+            combat_logger.debug("%s using weapon %s (%s vs %s)",
+                                attacker.name, weapon.description, attack_ability, defence_ability)
+            combat_logger.debug("%s ATK (%s=%d) vs (%s=%d) DEF of %s",
+                                attacker.name, attack_ability, attack, defence_ability, defence, target.name)
+            combat_logger.debug("Defender HP=%s", target.fighter.combat_class.get_property("HP"))
 
         # Did the attack succeed...?
         if attack > defence:
@@ -928,6 +1197,10 @@ class Floor():
 
         target.fighter.is_under_attack = True
 
+        # Fighting wakes up the target and makes a noise
+        self.wake_bot(target)
+        self.make_noise(attacker.xy)
+
         return success
 
     def run_ability_check(self, e: Entity):
@@ -953,10 +1226,9 @@ class Floor():
                 stats.append((ability, check.difficulty_value - ability_modifier))
 
             stats.sort(key=operator.itemgetter(1))
-            print(stats)
             # Pick the ability that has the lowest difficulty score
             ability, score = stats[0]
-            print(f'Chosen check = {stats[0]}')
+            items_logger.debug("Chosen check = %s from %s", stats[0], stats)
 
         elif len(checks) == 1:
             ability = list(checks.keys())[0]
@@ -968,7 +1240,7 @@ class Floor():
         # If we found an ability check....
         if check is not None:
 
-            print(str(check))
+            items_logger.debug("%s", check)
             # Make this entity non-checkable going forward!
             # You get one go at attempting the check!
             # e.set_property("IsCheckable", False)
@@ -1033,7 +1305,7 @@ class Floor():
                                   name=Event.ACTION_GAIN_XP,
                                   description=f"You gain {value} XP"))
                     else:
-                        print(f'get reward {stat}={value} but did nothing!')
+                        items_logger.warning("get reward %s=%s but did nothing!", stat, value)
 
             # If ability check failed...
             else:
@@ -1068,7 +1340,7 @@ class Floor():
                                   name=Event.ACTION_GAIN_XP,
                                   description=f"You gain {value} XP"))
                     else:
-                        print(f'get reward {stat}={value} but did nothing!')
+                        items_logger.warning("get reward %s=%s but did nothing!", stat, value)
 
 
         # No ability checks found for this Entity
@@ -1092,14 +1364,54 @@ class Floor():
 
         current_room = None
 
-        # Loop through the rooms to see if teh specified point is an a room
-        for room in self.map_rooms:
-            if room.contains_point(xy) is True:
-                current_room = room
-                break
+        # Look up which room the specified point is in
+        x, y = xy
+        if self.room_map is not None and self.is_valid_xy(x, y):
+            room_id = self.room_map[x, y]
+            if room_id >= 0:
+                current_room = self.map_rooms[room_id]
 
         return current_room
 
+    def get_room_ids(self, positions) -> np.ndarray:
+        """
+        Get the room id of each of a list of points on the Floor map
+        :param positions: the list of xy points that you want to check
+        :return: numpy array of indexes into map_rooms with -1 for any point that is not in a room
+        """
+        xy = np.array(positions, dtype=int).reshape(-1, 2)
+        room_ids = np.full(len(xy), -1, dtype=self.room_map.dtype if self.room_map is not None else int)
+
+        if self.room_map is not None and len(xy) > 0:
+            valid = (xy[:, 0] >= 0) & (xy[:, 0] < self.width) & (xy[:, 1] >= 0) & (xy[:, 1] < self.height)
+            room_ids[valid] = self.room_map[xy[valid, 0], xy[valid, 1]]
+
+        return room_ids
+
+    def get_entity_rooms(self, entities: list = None) -> list:
+        """
+        Find out which room each of a list of entities is in
+        :param entities: the entities that you want to check.  Default is all entities on the Floor
+        :return: a list of Room objects (or None if not in a room) in the same order as the entities
+        """
+        if entities is None:
+            entities = self.entities
+
+        room_ids = self.get_room_ids([e.xy for e in entities])
+
+        return [self.map_rooms[room_id] if room_id >= 0 else None for room_id in room_ids]
+
+    def build_room_map(self):
+        """
+        Build the array that records which room each tile on the Floor is in
+        """
+        self.room_map = np.full((self.width, self.height), -1, dtype=np.int16)
+
+        # Fill in rooms in reverse order so that the first room in the list wins if any overlap
+        for room_id in reversed(range(len(self.map_rooms))):
+            x, y, w, h = self.map_rooms[room_id].rect
+            self.room_map[max(x, 0):x + w, max(y, 0):y + h] = room_id
+
     def add_map_room(self, new_room: Room) -> bool:
         """
         Attemple to add a new room to the Floor map
@@ -1119,8 +1431,8 @@ class Floor():
         while overlap is True and attempts > 0:
 
             # Generate random centre for the new room
-            cx = random.randint(floor_rect.left, floor_rect.right)
-            cy = random.randint(floor_rect.top, floor_rect.bottom)
+            cx = self.rng.randint(floor_rect.left, floor_rect.right)
+            cy = self.rng.randint(floor_rect.top, floor_rect.bottom)
             new_room.rect.center = (cx, cy)
 
             # If the random room location fits within the floor boundaries...
@@ -1138,9 +1450,10 @@ class Floor():
         # If we found a free space for the new room add it to the floor map
         if overlap is False:
             self.map_rooms.append(new_room)
-            print(f'Added new room {new_room.name} at ({new_room.x},{new_room.y}) after {21 - attempts} attempts')
+            floor_logger.debug("Added new room %s at (%d,%d) after %d attempts",
+                               new_room.name, new_room.x, new_room.y, 21 - attempts)
         else:
-            print("Failed to Add room")
+            floor_logger.debug("Failed to add room")
 
         return not overlap
 
@@ -1151,7 +1464,7 @@ class Floor():
                     continue
                 x = room1.is_touching(room2)
 
-                print(f'room {room1.name} vs. room {room2.name}touching={x}')
+                floor_logger.info("room %s vs. room %s touching=%s", room1.name, room2.name, x)
 
     def build_floor_map(self):
         """
@@ -1167,42 +1480,37 @@ class Floor():
         self.explored = np.zeros((self.width, self.height), dtype=bool)
 
         # Start with nothing walkable!
-        self.walkable = np.zeros((self.width, self.height))
+        self.walkable = np.zeros((self.width, self.height), dtype=bool)
 
         # Start with no fg and bg colours specified
-        self.floor_tile_colours = np.full((self.width, self.height, 3), 0)
+        self.floor_tile_colours = np.zeros((self.width, self.height, 3), dtype=np.uint8)
 
         # Make floor walkable where tunnels are and store the floor tile colour
         for tunnel in self.map_tunnels:
             segments = tunnel.get_segments()
+            on_floor = (segments[:, 0] >= 0) & (segments[:, 0] < self.width) & \
+                       (segments[:, 1] >= 0) & (segments[:, 1] < self.height)
+            segments = segments[on_floor]
+            xs, ys = segments[:, 0], segments[:, 1]
 
-            for sx, sy in segments:
-                if self.is_valid_xy(sx, sy):
-
-                    # get the current colour at this position
-                    c = self.floor_tile_colours[sx, sy]
-                    current_colour = dim_rgb(c, 0)
+            self.walkable[xs, ys] = True
 
-                    # Calculate the l0 distance from the start of the tunnel
-                    start_l0, end_l0 = tunnel.get_segment_distances((sx, sy))
-                    total_l0 = start_l0 + end_l0
-                    from_start_pct = start_l0 / total_l0
-                    from_end_pct = end_l0 / total_l0
+            # Shade the tunnel from its start colour to its end colour based on the l0 distance from the start
+            start_l0, end_l0 = tunnel.get_segment_distances(segments)
+            from_start_pct = start_l0 / (start_l0 + end_l0)
+            new_colours = lerp_rgb(tunnel.start_bg, tunnel.end_bg, from_start_pct)
 
-                    self.walkable[sx, sy] = 1
+            # Blend with the colour of any tunnels that we have already drawn here
+            current_colours = self.floor_tile_colours[xs, ys]
+            blend = np.any(current_colours != 0, axis=1)
+            new_colours[blend] = lerp_rgb(current_colours[blend], new_colours[blend], 0.5)
 
-                    new_colour = libtcod.color_lerp(tunnel.start_bg, tunnel.end_bg, from_start_pct)
-                    if current_colour != libtcod.black:
-                        blended_colour = libtcod.color_lerp(current_colour, new_colour, 0.5)
-                    else:
-                        blended_colour = new_colour
-
-                    self.floor_tile_colours[sx, sy] = list(blended_colour)
+            self.floor_tile_colours[xs, ys] = new_colours
 
         # Make floor walkable where rooms are and store any floor tile colours
         for room in self.map_rooms:
             x, y, w, h = room.rect
-            self.walkable[x:x + w, y: y + h] = 1
+            self.walkable[x:x + w, y: y + h] = True
 
             # Create an outline around the room that is a darker colour than the room floor
             room_outline_bg = Palette.dim_hsl(room.bg, 0.75)
@@ -1211,8 +1519,8 @@ class Floor():
             # Fill in the room flow with its tile colour
             self.floor_tile_colours[x:x + w, y: y + h] = list(room.bg)
 
-        # Convert walkable to array of bools
-        self.walkable = self.walkable > 0
+        self.build_transparency_map()
+        self.build_room_map()
 
     def build_floor_cave(self, tile_colour, reset: bool = False):
         """
@@ -1230,27 +1538,30 @@ class Floor():
             self.explored = np.zeros((self.width, self.height), dtype=bool)
 
             # Start with nothing walkable!
-            self.walkable = np.zeros((self.width, self.height))
+            self.walkable = np.zeros((self.width, self.height), dtype=bool)
 
-        other_walkable = np.zeros((self.width, self.height))
+        other_walkable = np.zeros((self.width, self.height), dtype=bool)
 
         # Start with no fg and bg colours specified then populate with specified tile colour
-        self.floor_tile_colours = np.full((self.width, self.height, 3), 0)
+        self.floor_tile_colours = np.zeros((self.width, self.height, 3), dtype=np.uint8)
         self.floor_tile_colours[:, :] = list(tile_colour)
 
         # Make a column with random walkable middle areas and some random non-walkable points
         for x in range(1, self.width - 1):
-            other_walkable[x, 2 + random.randint(0, 5):self.height - 2 - random.randint(0, 5)] = 1
-            other_walkable[x] = np.logical_and(other_walkable[x], random.choices([0, 1], [10, 90], k=self.height))
+            other_walkable[x, 2 + self.rng.randint(0, 5):self.height - 2 - self.rng.randint(0, 5)] = 1
+            other_walkable[x] = np.logical_and(other_walkable[x], self.rng.choices([0, 1], [10, 90], k=self.height))
 
         # Make row with random non-walkable edges
         for y in range(2, self.height - 4):
-            other_walkable[:random.randint(0, 5), y] = 0
-            other_walkable[random.randint(-5, -1):, y] = 0
+            other_walkable[:self.rng.randint(0, 5), y] = 0
+            other_walkable[self.rng.randint(-5, -1):, y] = 0
 
         # Logical OR of current walkable grid and the random cave grid
         self.walkable = np.logical_or(self.walkable, other_walkable)
 
+        self.build_transparency_map()
+        self.build_room_map()
+
     def reveal_map(self, only_exit=False):
         """
         Reveal  parts of the Floor map by "exploring" them
@@ -1275,8 +1586,15 @@ class Floor():
         :param probability: probability of success for each entity that matches
         """
         self._revealed_entities = list(set(self.entities) & set(self._revealed_entities))
-        for e in self.entities:
-            if e.get_property(property_name) == True and random.randint(1, 100) <= probability:
+
+        if property_name in EntityStore.FLAG_BITS:
+            matches = self.entity_store.select(self.entity_store.get_mask(property_name=property_name))
+        else:
+            matches = [e for e in self.entities if e.get_property(property_name) == True]
+
+        rng = self.random_streams.get_stream(RandomStreams.ITEMS)
+        for e in matches:
+            if rng.randint(1, 100) <= probability:
                 self._revealed_entities.append(e)
 
     def reveal_entities_by_name(self, entity_name: str, probability: int = 100):
@@ -1286,8 +1604,9 @@ class Floor():
         :param probability: probability of success for each entity that matches
         """
         self._revealed_entities = list(set(self.entities) & set(self._revealed_entities))
-        for e in self.entities:
-            if e.name == entity_name and random.randint(1, 100) <= probability:
+        rng = self.random_streams.get_stream(RandomStreams.ITEMS)
+        for e in self.entity_store.select(self.entity_store.get_mask(name=entity_name)):
+            if rng.randint(1, 100) <= probability:
                 self._revealed_entities.append(e)
 
     def swap_entities_by_name(self, entity_name: str, new_entity_list, probability: int = 100):
@@ -1297,11 +1616,12 @@ class Floor():
         :param new_entity_list: the list of entity names to swap it with
         :param probability: the probability of a successful swap happening for each matching entity
         """
-        for e in self.entities:
-            if e.name == entity_name and random.randint(1, 100) <= probability:
-                new_entity = EntityFactory.get_entity_by_name(random.choice(new_entity_list))
+        rng = self.random_streams.get_stream(RandomStreams.ITEMS)
+        for e in self.entity_store.select(self.entity_store.get_mask(name=entity_name)):
+            if rng.randint(1, 100) <= probability:
+                new_entity = EntityFactory.get_entity_by_name(rng.choice(new_entity_list))
                 self.swap_entity(e, new_entity)
-                print(f'\tyou swap {entity_name} for {new_entity.name}')
+                floor_logger.debug("Swapped %s for %s", entity_name, new_entity.name)
 
     def recompute_fov(self, x=None, y=None, radius=None, light_walls=True, algorithm=0):
         """
@@ -1323,34 +1643,150 @@ class Floor():
         if radius is None:
             radius = self.fov_radius
 
-        walkable = self.walkable.copy()
-        for e in self.entities:
-            if e.get_property("IsTransparent") == False:
-                walkable[e.x, e.y] = False
+        self.fov_map = self.get_fov(x, y, radius, light_walls, algorithm)
 
-        # Use libtcod librarty function to calculate field of view
-        self.fov_map = libtcod.map.compute_fov(walkable,
-                                               (x, y),
-                                               radius,
-                                               light_walls,
-                                               algorithm)
-
-        # Add FOV cells to explored cells
-        self.explored |= self.fov_map
+        # Add FOV cells to explored cells in place
+        np.logical_or(self.explored, self.fov_map, out=self.explored)
+        self._fov_dirty = False
 
         return self.fov_map
 
-    def get_walkable_cells(self):
-        results = np.where(self.walkable > 0)
-        return list(zip(results[0], results[1]))
+    def get_fov(self, x: int, y: int, radius: int, light_walls=True, algorithm=0):
+        """
+        Get the Field of View from a position on the Floor using the cache of recently calculated FOV maps if we can
+        :param x: x position on Floor
+        :param y: y position on Floor
+        :param radius: radius of the Field of View
+        :param light_walls: Are list walls included in the FOV results?
+        :param algorithm: which libtcod FOV algorithm to use
+        :return: a read-only numpy array of the tiles in the FOV
+        """
+        key = (x, y, radius, light_walls, algorithm, self._transparency_version)
+        fov = self._fov_cache.get(key)
+
+        if fov is not None:
+            self.fov_cache_hits += 1
+            self._fov_cache.move_to_end(key)
+        else:
+            self.fov_cache_misses += 1
+
+            # Use libtcod librarty function to calculate field of view
+            fov = libtcod.map.compute_fov(self.transparent,
+                                          (x, y),
+                                          radius,
+                                          light_walls,
+                                          algorithm)
+
+            # Cached maps are shared so make sure that nobody can change them
+            fov.setflags(write=False)
+            self._fov_cache[key] = fov
+            if len(self._fov_cache) > Floor.FOV_CACHE_SIZE:
+                self._fov_cache.popitem(last=False)
+
+        return fov
+
+    def get_player_distance_map(self) -> np.ndarray:
+        """
+        Get the walking distance from every tile on the Floor to the player.
+        Only recalculated when the player has moved or the terrain has changed.  Other bots are not treated as
+        obstacles here: move_entity() stops a bot from stepping onto a tile that another bot is standing on.
+        :return: numpy array of distances with tiles that can't reach the player set to a large value
+        """
+        key = (self.player.xy, self._terrain_version)
+
+        if key != self._player_distance_key:
+            shape = (self.width, self.height)
+            if self._walk_cost is None or self._walk_cost.shape != shape:
+                self._walk_cost = np.zeros(shape, dtype=np.int8)
+                self._player_distance_map = np.zeros(shape, dtype=np.int32)
+
+            # Bots can only walk on tiles that are not blocked by a solid entity other than the player or a bot
+            cost = self._walk_cost
+            np.copyto(cost, self.walkable)
+
+            store = self.entity_store
+            solid = store.active & ((store.flags & (EntityStore.FLAG_BITS["IsWalkable"] |
+                                                    EntityStore.FLAG_BITS["IsEnemy"])) == 0) & \
+                    (store.x >= 0) & (store.x < self.width) & (store.y >= 0) & (store.y < self.height)
+            cost[store.x[solid], store.y[solid]] = 0
+            cost[self.player.xy] = 1
+
+            # Spread out from the player's position
+            distance = self._player_distance_map
+            distance.fill(np.iinfo(np.int32).max)
+            distance[self.player.xy] = 0
+            libtcod.path.dijkstra2d(distance, cost, 1, None, out=distance)
+
+            self._player_distance_key = key
+
+        return self._player_distance_map
+
+    def get_step_towards_player(self, x: int, y: int, directions: list) -> tuple:
+        """
+        Get the step that takes you closest to the player from a specified position on the Floor
+        :param x: x position on Floor
+        :param y: y position on Floor
+        :param directions: list of (dx, dy) steps that you are allowed to take
+        :return: the best (dx, dy) step or None if none of the steps get you any closer
+        """
+        distance = self.get_player_distance_map()
 
-    def get_explored_cells(self):
-        results = np.where(self.explored > 0)
-        return list(zip(results[0], results[1]))
+        best_step = None
+        best_distance = distance[x, y]
 
-    def get_fov_cells(self):
-        results = np.where(self.fov_map > 0)
-        return list(zip(results[0], results[1]))
+        for dx, dy in directions:
+            nx = x + dx
+            ny = y + dy
+            if self.is_valid_xy(nx, ny) and distance[nx, ny] < best_distance:
+                best_step = (dx, dy)
+                best_distance = distance[nx, ny]
+
+        return best_step
+
+    def is_walkable(self, x: int, y: int) -> bool:
+        """
+        Is the specified xy position on the Floor a tile that you can walk on?
+        """
+        return self.is_valid_xy(x, y) and bool(self.walkable[x, y])
+
+    def is_explored(self, x: int, y: int) -> bool:
+        """
+        Has the specified xy position on the Floor been explored yet?
+        """
+        return self.explored is not None and self.is_valid_xy(x, y) and bool(self.explored[x, y])
+
+    def is_in_fov(self, x: int, y: int) -> bool:
+        """
+        Is the specified xy position on the Floor in the current Field of View?
+        """
+        return self.fov_map is not None and self.is_valid_xy(x, y) and bool(self.fov_map[x, y])
+
+    def get_floor_tile_colour(self, x: int, y: int) -> list:
+        """
+        Get the colour of a floor tile as a list of ints that are safe to do colour arithmetic with
+        """
+        return self.floor_tile_colours[x, y].tolist()
+
+    def get_entities_in_fov(self, entities: list = None) -> list:
+        """
+        Find which entities are in the current Field of View by looking up all of their positions
+        in the FOV map in one go
+        :param entities: the list of entities that you want to check. Default is all entities on this Floor
+        :return: the list of entities that are in the FOV
+        """
+        if self.fov_map is None:
+            return []
+
+        if entities is None:
+            return self.entity_store.select(self.entity_store.get_mask(fov_map=self.fov_map))
+
+        if len(entities) == 0:
+            return []
+
+        xy = np.array([e.xy for e in entities])
+        in_fov = self.fov_map[xy[:, 0], xy[:, 1]]
+
+        return [e for e, visible in zip(entities, in_fov) if visible]
 
     def get_fov_light_attenuation(self, ox: int, oy: int, factor: float = 1.0):
         px, py = self.player.xy
@@ -1359,23 +1795,118 @@ class Floor():
     def get_revealed_entities(self):
         return self.revealed_entities
 
-    def tick(self):
+    @property
+    def active_bots(self) -> list:
+        return [bot for bot in self.bots if bot in self.scheduler]
+
+    @property
+    def active_bot_count(self) -> int:
+        return len(self.scheduler) - (1 if self.player in self.scheduler else 0)
+
+    def update_bot_activity(self):
         """
-        Do a tick on this Floor
+        Work out which bots are worth ticking and put the rest to sleep.  Bots stay awake if they are:-
+        - within the activity radius of the player
+        - in the player's current room or the rooms either side of it
+        - have recently been woken up by an attack or a noise
+        Only recalculated when the player has moved.
         """
-        dead_bots = []
+        if self.player is None or self.player.xy == self._bot_activity_xy:
+            return
+
+        self._bot_activity_xy = self.player.xy
+
+        if len(self.bots) == 0:
+            return
+
+        # Which bots are close to the player?
+        px, py = self.player.xy
+        xy = np.array([bot.bot_entity.xy for bot in self.bots])
+        awake = ((xy[:, 0] - px) ** 2 + (xy[:, 1] - py) ** 2) <= Floor.BOT_ACTIVITY_RADIUS ** 2
+
+        # Rooms next to each other in the list are joined by a tunnel so treat them as nearby
+        room_id = self.get_room_ids([self.player.xy])[0]
+        if room_id >= 0:
+            nearby_room_ids = [r for r in (room_id - 1, room_id, room_id + 1) if r >= 0]
+            awake |= np.isin(self.get_room_ids(xy), nearby_room_ids)
+
+        for bot, is_awake in zip(self.bots, awake):
+            if is_awake or bot.wake_ticks > 0:
+                bot.wake()
+                if bot not in self.scheduler:
+                    self.scheduler.schedule(bot)
+            else:
+                bot.sleep()
+                self.scheduler.remove(bot)
 
-        # Tick all bots and collect any dead ones
+    def wake_bot(self, target: Entity):
+        """
+        Wake up the bot that controls a specified Entity e.g. because it is being attacked
+        :param target: the Entity whose bot you want to wake up
+        """
         for bot in self.bots:
+            if bot.bot_entity is target:
+                self._wake_bot(bot)
+                break
+
+    def make_noise(self, xy: tuple, radius: int = None):
+        """
+        Wake up any sleeping bots that are close enough to hear a noise
+        :param xy: where the noise was made
+        :param radius: how far away can the noise be heard.  Default is the class default
+        """
+        if radius is None:
+            radius = Floor.NOISE_RADIUS
+
+        sleeping_bots = [bot for bot in self.bots if bot.is_asleep is True]
+        if len(sleeping_bots) == 0:
+            return
+
+        x, y = xy
+        bot_xy = np.array([bot.bot_entity.xy for bot in sleeping_bots])
+        heard = ((bot_xy[:, 0] - x) ** 2 + (bot_xy[:, 1] - y) ** 2) <= radius ** 2
+
+        for bot, has_heard in zip(sleeping_bots, heard):
+            if has_heard:
+                self._wake_bot(bot)
+
+    def _wake_bot(self, bot):
+        bot.wake(Floor.BOT_WAKE_TICKS)
+        if bot not in self.scheduler:
+            self.scheduler.schedule(bot)
+
+    def tick(self):
+        """
+        Do a tick on this Floor.  The player has just taken their turn so let every bot that is due
+        to act before the player's next turn take theirs.
+        """
+
+        # Put any bots that are far away from the player to sleep
+        self.update_bot_activity()
+
+        # Schedule the player's next turn based on how fast they are
+        if self.player is not None:
+            player_speed = self.player.combat_class.get_property("Speed")
+            self.scheduler.schedule(self.player, TurnScheduler.get_action_delay(player_speed))
+
+        # Tick bots in turn order until it is the player's turn again
+        while True:
+            bot = self.scheduler.pop()
+            if bot is None or bot is self.player:
+                break
+
             bot.tick()
+
+            # Remove any dead bots otherwise schedule their next turn
             if bot.is_dead is True:
-                dead_bots.append(bot)
+                ai_logger.debug("Bot %s is dead", bot)
+                self.bots.remove(bot)
+            else:
+                self.scheduler.schedule(bot, TurnScheduler.get_action_delay(bot.speed))
 
-        # Remove any dead bots
-        # (can't remove and iterate at the same time!)
-        for bot in dead_bots:
-            print(f'Bot {bot} is dead')
-            self.bots.remove(bot)
+        # If something changed what the player can see e.g. an enemy turned into a corpse then update the FOV
+        if self._fov_dirty is True and self.player is not None:
+            self.recompute_fov()
 
 
 class Shop():
@@ -1395,7 +1926,7 @@ class Shop():
         self.name = f'The Shop on Level {self.floor.level}'
 
         # Get the list of tradable entities and sort them alphabetically
-        self.buy_list = [e for e in self.floor.entities if e.get_property("IsTradable") == True]
+        self.buy_list = self.floor.entity_store.select(self.floor.entity_store.get_mask(property_name="IsTradable"))
         self.buy_list.sort(key=operator.attrgetter('description'))
 
         self.build_items_by_category()
@@ -1421,6 +1952,152 @@ class Shop():
         self.build_items_by_category()
 
 
+def generate_floor(seed: int, width: int, height: int, level: int, params: dict):
+    """
+    Generate a new Floor from its own random seed so that it comes out the same whichever process builds it
+    :param seed: the random seed for this Floor
+    :param width: width of the Floor
+    :param height: height of the Floor
+    :param level: dungeon level of the Floor
+    :param params: the game parameters for the level
+    :return: the new Floor and how many seconds it took to generate
+    """
+    start_time = time.perf_counter()
+
+    # The Floor generates its own name when it is initialised
+    new_floor = Floor(None, width, height, level=level, params=params, seed=seed)
+    new_floor.initialise(EventQueue())
+
+    return new_floor, time.perf_counter() - start_time
+
+
+class FloorPrefetcher():
+    """
+    Generate the next Floor in a worker process while the Player is exploring the current one.
+    If the worker is still working on the Floor when the Player takes the stairs then we wait for it to finish.
+    If the worker isn't working on the right Floor then the Floor is generated synchronously instead using the same seed.
+    """
+
+    # Worker processes are shared by every Model so that starting a new game doesn't start more processes
+    executor = None
+
+    def __init__(self):
+        self.pending = None
+        self.pending_level = None
+        self.pending_seed = None
+
+        # Stats
+        self.hits = 0
+        self.waits = 0
+        self.misses = 0
+        self.generation_times = []
+
+    def __getstate__(self):
+        # Don't save the pending worker request with the game
+        state = self.__dict__.copy()
+        state["pending"] = None
+        state["pending_level"] = None
+        state["pending_seed"] = None
+        return state
+
+    @property
+    def hit_rate(self) -> float:
+        requests = self.hits + self.waits + self.misses
+        return self.hits / requests if requests > 0 else 0.0
+
+    @staticmethod
+    def get_executor() -> concurrent.futures.Executor:
+        if FloorPrefetcher.executor is None:
+            FloorPrefetcher.executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=FloorPrefetcher.initialise_worker,
+                initargs=(logging.getLogger("roguelike").level,))
+        return FloorPrefetcher.executor
+
+    @staticmethod
+    def initialise_worker(log_level: int):
+        """
+        Load the game data into a new worker process
+        """
+        configure_logging(log_level)
+        Model.load_game_data()
+
+    @staticmethod
+    def close():
+        if FloorPrefetcher.executor is not None:
+            FloorPrefetcher.executor.shutdown(wait=False, cancel_futures=True)
+            FloorPrefetcher.executor = None
+
+    def request_floor(self, seed: int, width: int, height: int, level: int, params: dict):
+        """
+        Start generating a Floor in the background
+        """
+        self.cancel()
+
+        self.pending_level = level
+        self.pending_seed = seed
+
+        try:
+            self.pending = FloorPrefetcher.get_executor().submit(generate_floor, seed, width, height, level, params)
+        except (OSError, RuntimeError) as err:
+            floor_logger.warning("Can't prefetch floors in the background: %s", err)
+            self.pending = None
+
+    def cancel(self):
+        if self.pending is not None:
+            self.pending.cancel()
+        self.pending = None
+        self.pending_level = None
+        self.pending_seed = None
+
+    def get_floor(self, seed: int, width: int, height: int, level: int, params: dict) -> Floor:
+        """
+        Get the Floor for a level using the prefetched Floor if the worker is generating it
+        :return: the new Floor
+        """
+        new_floor = None
+
+        if self.pending is not None and self.pending_level == level and self.pending_seed == seed \
+                and self.pending.cancelled() is False:
+
+            # Wait for the worker rather than generating the same floor again while it carries on in the background
+            finished = self.pending.done()
+            try:
+                new_floor, seconds = self.pending.result()
+                if finished is True:
+                    self.hits += 1
+                else:
+                    self.waits += 1
+            except Exception as err:
+                floor_logger.warning("Floor prefetch for level %i failed: %s", level, err)
+
+        # Stop the worker working on the wrong floor before we generate the right one ourselves
+        self.cancel()
+
+        if new_floor is None:
+            self.misses += 1
+            new_floor, seconds = generate_floor(seed, width, height, level, params)
+
+        self.generation_times.append(seconds)
+
+        floor_logger.info("Floor %i generated in %.3fs (prefetch hit rate %.0f%%)", level, seconds,
+                          self.hit_rate * 100)
+
+        return new_floor
+
+    def get_stats(self) -> list:
+        stats_text = []
+
+        stats_text.append(f"Prefetch hits={self.hits}, waits={self.waits}, misses={self.misses}, "
+                          f"hit rate={self.hit_rate * 100:0.0f}%")
+        if len(self.generation_times) > 0:
+            average = sum(self.generation_times) / len(self.generation_times)
+            stats_text.append(f"Floor generation time={average:0.3f}s average, {max(self.generation_times):0.3f}s max")
+
+        return stats_text
+
+
 class Model():
     """
     Description:
@@ -1432,8 +2109,13 @@ class Model():
     GAME_STATE_LOADED = "loaded"
     GAME_STATE_GAME_OVER = "game over"
 
-    def __init__(self, name: str):
+    # How many floors to keep in memory.  Older floors are paged out to disk until the player goes back to them
+    RESIDENT_FLOORS = 3
+
+    def __init__(self, name: str, prefetch_floors: bool = False, seed: int = None):
         """:arg name the name that you want to give to this game
+        :arg prefetch_floors generate the next Floor in a background process?
+        :arg seed the master random seed for the game.  Default is a random seed
         """
 
         # Properties of the game
@@ -1441,17 +2123,22 @@ class Model():
         self.dungeon_level = 0
         self.state = None
 
+        # Random number streams for the game.  Each Floor gets its own streams derived from the master seed
+        self.random_streams = RandomStreams(seed)
+
         # Contents of the game
         self.player = None
         self.inventory = {}
         self.entities = None
         self.ability_checks = None
-        self.floors = []
+        self.floors = FloorCache(resident_limit=Model.RESIDENT_FLOORS)
         self.current_floor = None
         self.shop = None
         self.journal = None
         self.events = EventQueue()
+        self.floors.shared["events"] = self.events
         self.item_user = None
+        self.floor_prefetcher = FloorPrefetcher() if prefetch_floors is True else None
 
     def initialise(self, floor_width=50, floor_height=50):
         """
@@ -1462,25 +2149,14 @@ class Model():
         self.floor_width = floor_width
         self.floor_height = floor_height
 
+        Model.load_game_data()
 
-        # Load game data from specified files
-        ThemeManager.load_room_names("room_names.csv")
-        ThemeManager.load_history_data("rogue_history.cfg")
-        ThemeManager.load_room_colour_palettes("room_palettes.csv")
-        ThemeManager.load_floor_colour_palettes("floor_palettes.csv")
-        GameParameters.load("game_parameters.csv")
-        EntityFactory.load("entities.csv")
-        AbilityChecksFactory.load("ability_checks.csv")
-        CombatClassFactory.load("combat_classes.csv")
-        CombatEquipmentFactory.load("combat_equipment.csv")
-        SpellFactory.load("spells.csv")
-        RaceFactory.load("races.csv")
-        LevelFactory.load("levels.csv")
-
+        # Use the game's random number streams until we have a floor
+        self.random_streams.activate()
 
         if self.player is None:
             name = ThemeManager.get_random_history("Name")
-            race_name = random.choice(RaceFactory.get_available_races())
+            race_name = get_stream(RandomStreams.GENERATION).choice(RaceFactory.get_available_races())
             self.add_player(self.generate_player(name=name, class_name="Wizard", race_name=race_name))
 
         self.next_floor()
@@ -1494,7 +2170,9 @@ class Model():
             entities = EntityFactory.get_entities_by_category(category)
             self.item_user.add_randomiser_group(category, entities)
 
-        self.item_user.randomise()
+        # Which potions and scrolls do what is decided once for the whole game
+        with self.random_streams.using():
+            self.item_user.randomise()
 
         self.shop = Shop(f'{self.name} Shop')
         self.shop.initialise(self.current_floor)
@@ -1502,10 +2180,47 @@ class Model():
         self.journal = Journal()
         self.journal.initialise(self)
 
-    def load_game_parameters(self, level=1, XP=0) -> dict:
+    @staticmethod
+    def load_game_data():
         """
+        Load the game data from the data files using the compiled data pack if we can
+        """
+        DataPack.load()
+        ThemeManager.load_room_names("room_names.csv")
+        ThemeManager.load_history_data("rogue_history.cfg")
+        ThemeManager.load_room_colour_palettes("room_palettes.csv")
+        ThemeManager.load_floor_colour_palettes("floor_palettes.csv")
+        GameParameters.load("game_parameters.csv")
+        EntityFactory.load("entities.csv")
+        AbilityChecksFactory.load("ability_checks.csv")
+        CombatClassFactory.load("combat_classes.csv")
+        CombatEquipmentFactory.load("combat_equipment.csv")
+        SpellFactory.load("spells.csv")
+        RaceFactory.load("races.csv")
+        LevelFactory.load("levels.csv")
 
-        :return:
+    def activate_random_streams(self):
+        """
+        Make the current Floor's random number streams the active ones so that combat, dice, checks, items and lore
+        on each floor only depend on the game's master seed and the level.  Before there is a floor use the game's.
+        """
+        if self.current_floor is not None:
+            self.current_floor.random_streams.activate()
+        else:
+            self.random_streams.activate()
+
+    def get_floor_seed(self, level: int) -> int:
+        """
+        Get the random seed for a dungeon level.  It only depends on the game's master seed and the level
+        """
+        return self.random_streams.get_seed(RandomStreams.FLOOR, level)
+
+    def load_game_parameters(self, level=None, XP=None) -> dict:
+        """
+        Calculate the game parameters for a dungeon level
+        :param level: the dungeon level.  Default is the current dungeon level
+        :param XP: the Player's XP.  Default is the Player's current XP
+        :return: dictionary of the Room, Floor and Game parameters
         """
 
         # Dictionary to store the calculated Room, Floor and Game parameters
@@ -1514,30 +2229,27 @@ class Model():
                            "Game": {}}
 
         # Current inputs required for the calculations
-        current_input = {"Level": self.dungeon_level,
-                         "XP": self.player.get_property("XP")}
+        current_input = {"Level": self.dungeon_level if level is None else level,
+                         "XP": self.player.get_property("XP") if XP is None else XP}
+
+        # Look up the y value of every parameter for the current x values in one go
+        yvalues = GameParameters.get_values(current_input)
 
         # For each of the Room and Floor level parameters
         for scope in game_parameters.keys():
 
-            # Get the list of parameters that we need to calculate
-            scope_parameters = list(GameParameters.get_parameters_by_scope(scope))
+            # For each parameter in this scope...
+            for i in GameParameters.get_parameter_indexes_by_scope(scope):
 
-            # For each parameter...
-            for yname, ymetric in scope_parameters:
-
-                # Get the name of the x input parameter that we need for y=f(x)
-                xname = GameParameters.get_parameter_input(yname, ymetric)
-
-                # Calculate y value based on x value
-                yvalue = int(GameParameters.get_parameter(yname, ymetric, current_input[xname]))
+                yname, ymetric = GameParameters.keys[i]
+                yvalue = int(yvalues[i])
 
                 # Store yname, ymetric and yvalue in our results dictionary
                 if yname not in game_parameters[scope].keys():
                     game_parameters[scope][yname] = {}
                 game_parameters[scope][yname][ymetric] = yvalue
 
-            print(game_parameters)
+            data_logger.debug("Game parameters: %s", game_parameters)
 
         # assert False
 
@@ -1631,7 +2343,7 @@ class Model():
                             category=player_entity.category,
                             fg=player_entity.fg)
 
-        new_player.properties = copy.deepcopy(player_entity.properties)
+        new_player.properties = player_entity.properties
 
         # Assign them a combat class and race
         cc = CombatClassFactory.get_combat_class_by_name(class_name)
@@ -1680,6 +2392,7 @@ class Model():
 
     def add_player(self, new_player: Player):
         self.player = new_player
+        self.floors.shared["player"] = new_player
 
         self.events.add_event(Event(type=Event.GAME,
                                     name=Event.GAME_NEW_PLAYER,
@@ -1775,7 +2488,8 @@ class Model():
         shop_floor = Floor(f'The Shop on Level {self.dungeon_level}',
                            50, 50,
                            level=self.dungeon_level,
-                           params=game_parameters)
+                           params=game_parameters,
+                           seed=self.current_floor.random_streams.get_stream(RandomStreams.SHOP).getrandbits(64))
 
         shop_floor.initialise(self.events)
 
@@ -1790,6 +2504,7 @@ class Model():
 
             # Get the floor
             self.current_floor = self.floors[self.dungeon_level - 1]
+            self.activate_random_streams()
 
             # Add the player at the end of the previous level
             self.current_floor.add_player(self.player, first_room=False)
@@ -1854,15 +2569,27 @@ class Model():
         game_parameters = self.load_game_parameters()
 
         # If the new level doesn't exist yet then create it...
-        if self.dungeon_level > len(self.floors):
+        if self.dungeon_level > len(self.floors) and self.floor_prefetcher is not None:
+
+            # Use the floor that we generated in the background if it is ready
+            self.current_floor = self.floor_prefetcher.get_floor(self.get_floor_seed(self.dungeon_level),
+                                                                 self.floor_width,
+                                                                 self.floor_height,
+                                                                 level=self.dungeon_level,
+                                                                 params=game_parameters)
+            self.events.events.extend(self.current_floor.events.events)
+            self.current_floor.events = self.events
+            self.floors.append(self.current_floor)
+
+        elif self.dungeon_level > len(self.floors):
 
             # Create a new floor and initialise it
-            floor_name = ThemeManager.get_random_history("Floor")
-            self.current_floor = Floor(floor_name,
+            self.current_floor = Floor(None,
                                        self.floor_width,
                                        self.floor_height,
                                        level=self.dungeon_level,
-                                       params=game_parameters)
+                                       params=game_parameters,
+                                       seed=self.get_floor_seed(self.dungeon_level))
 
             self.current_floor.initialise(self.events)
             self.floors.append(self.current_floor)
@@ -1871,6 +2598,8 @@ class Model():
         else:
             self.current_floor = self.floors[self.dungeon_level - 1]
 
+        self.activate_random_streams()
+
         # Add the player at the start of the new level
         self.current_floor.add_player(self.player)
         self.events.add_event(Event(type=Event.GAME,
@@ -1890,6 +2619,16 @@ class Model():
         if self.dungeon_level % 3 == 0:
             self.player.fighter.spell_book.reset(Spell.FREQUENCY_PER_LEVEL)
 
+        # Start generating the next floor in the background if we haven't been there yet
+        next_level = self.dungeon_level + 1
+        if self.floor_prefetcher is not None and next_level > len(self.floors) \
+                and self.floor_prefetcher.pending_level != next_level:
+            self.floor_prefetcher.request_floor(self.get_floor_seed(next_level),
+                                                self.floor_width,
+                                                self.floor_height,
+                                                level=next_level,
+                                                params=self.load_game_parameters(level=next_level))
+
     def equip_item(self, new_item: Entity) -> bool:
         """
         Attempt to equip the specified item
@@ -1940,8 +2679,7 @@ class Model():
         if e is None:
             success = self.player.drop_item(old_item)
             if success is True:
-                old_item.xy = self.player.xy
-                self.current_floor.entities.append(old_item)
+                self.current_floor.add_entity(old_item, self.player.xy)
                 self.events.add_event(Event(type=Event.GAME,
                                             name=Event.ACTION_SUCCEEDED,
                                             description=f"You drop {old_item.description} here"))
@@ -2252,7 +2990,7 @@ class SpellCaster:
         success = True
         self.floor = floor
 
-        print(f'Casting spell {spell.name} on Floor {floor.name}')
+        combat_logger.debug("Casting spell %s on Floor %s", spell.name, floor.name)
 
         # If this is an attack spell...
         if spell.is_attack is True:
@@ -2312,14 +3050,17 @@ class SpellCaster:
         defence_ability = spell.defense
 
         # Roll a 20 sided dice and add to attack power
-        attack = attacker.fighter.get_attack(attack_ability) + random.randint(1, 20)
+        attack = attacker.fighter.get_attack(attack_ability) + get_stream(RandomStreams.COMBAT).randint(1, 20)
 
         # Calculate the target's ability defence
         defence = target.fighter.get_defence(defence_ability)
 
-        print(f'{attacker.name} using weapon {spell.name} ({attack_ability} vs {defence_ability})')
-        print(f'{attacker.name} ATK ({attack_ability}={attack}) vs ({defence_ability}={defence}) DEF of {target.name}')
-        print(f'Defender HP={target.fighter.combat_class.get_property("HP")}')
+        if combat_logger.isEnabledFor(logging.DEBUG):
+            combat_logger.debug("%s using spell %s (%s vs %s)",
+                                attacker.name, spell.name, attack_ability, defence_ability)
+            combat_logger.debug("%s ATK (%s=%d) vs (%s=%d) DEF of %s",
+                                attacker.name, attack_ability, attack, defence_ability, defence, target.name)
+            combat_logger.debug("Defender HP=%s", target.fighter.combat_class.get_property("HP"))
 
         # Did the attack succeed...?
         if attack > defence:
@@ -2365,6 +3106,8 @@ class SpellCaster:
             self.effect = f'Your {spell.name} spell misses {target.description}'
 
         target.fighter.is_under_attack = True
+        self.floor.wake_bot(target)
+        self.floor.make_noise(target.xy)
         spell.use()
 
         return success
@@ -2422,7 +3165,7 @@ class ItemUser():
             a_names = [i.name for i in a]
 
             # Shuffle the list of items into a new list
-            b = random.sample(a, len(a))
+            b = get_stream(RandomStreams.ITEMS).sample(a, len(a))
 
             # Zip the original item names to teh shuffled list
             c = zip(a_names, b)
@@ -2430,7 +3173,7 @@ class ItemUser():
             # Store the mapping
             self.random_entity_map.update(dict(c))
 
-        print(f'\t{self.random_entity_map}')
+        items_logger.debug("Random item map: %s", self.random_entity_map)
 
     def process(self, item: Entity, floor: Floor) -> bool:
         """
@@ -2449,7 +3192,7 @@ class ItemUser():
         # If the specified has been randomised then map it to the random item
         if item.name in self.random_entity_map.keys():
             item = self.random_entity_map[original_item.name]
-            print(f'\t** Using {item.name} instead of {original_item.name}')
+            items_logger.debug("Using %s instead of %s", item.name, original_item.name)
 
         success = True
         drop = True
@@ -2472,14 +3215,14 @@ class ItemUser():
         elif item.name == "Small Bubbling Potion":
             level = player.get_property("Level")
             effect = "The potion grants you increased experience!"
-            XP_reward = random.randint(level * 10, level * 50)
+            XP_reward = get_stream(RandomStreams.ITEMS).randint(level * 10, level * 50)
             player.fighter.add_XP(XP_reward)
 
         # Reveal the whole Floor map!!!
         elif item.name == "Map":
             intelligence = player.get_property("INT")
             probability = int(100 * intelligence / 50)
-            if random.randint(1, 100) < probability:
+            if get_stream(RandomStreams.ITEMS).randint(1, 100) < probability:
                 floor.reveal_map()
                 effect = "You read the map to learn the layout of this floor!"
             else:
@@ -2540,7 +3283,8 @@ class ItemUser():
         elif item.name in self.item_swaps:
             swaps = self.item_swaps[item.name]
             if item_at_tile is not None and item_at_tile.name in swaps:
-                new_entity = EntityFactory.get_entity_by_name(random.choice(swaps[item_at_tile.name]))
+                new_entity_name = get_stream(RandomStreams.ITEMS).choice(swaps[item_at_tile.name])
+                new_entity = EntityFactory.get_entity_by_name(new_entity_name)
                 floor.swap_entity(item_at_tile, new_entity)
                 if new_entity is not None:
                     effect = f'You use {item.description}' \
@@ -2576,7 +3320,8 @@ class ItemUser():
 
         # Is the item swappable?
         elif item.name in self.entity_swaps:
-            new_entity = EntityFactory.get_entity_by_name(random.choice(self.entity_swaps[item.name]))
+            new_entity_name = get_stream(RandomStreams.ITEMS).choice(self.entity_swaps[item.name])
+            new_entity = EntityFactory.get_entity_by_name(new_entity_name)
             floor.swap_entity(item, new_entity)
             effect = f'You break open {item.description}' \
                      f' and reveal {new_entity.description}'
@@ -2610,10 +3355,24 @@ class AIBot:
         self.tick_count = 1
         self._debug = False
 
+        # How fast does the bot act compared to a normal actor?
+        self.speed = TurnScheduler.NORMAL_SPEED / tick_slow_factor
+
+        # Is the bot asleep and how many more ticks does it stay awake for after something woke it up?
+        self.is_asleep = False
+        self.wake_ticks = 0
+
     @property
     def is_dead(self):
         return self.bot_entity.state == Entity.STATE_DEAD
 
+    def sleep(self):
+        self.is_asleep = True
+
+    def wake(self, ticks: int = 0):
+        self.is_asleep = False
+        self.wake_ticks = max(self.wake_ticks, ticks)
+
     def debug(self, debug_on: bool = None):
         if debug_on is None:
             self._debug = not self._debug
@@ -2621,8 +3380,14 @@ class AIBot:
             self._debug = debug_on
 
     def tick(self):
+        """
+        Tick this Bot.  How often a bot gets ticked is controlled by its speed in the Floor's TurnScheduler.
+        :return: True if the bot can act
+        """
         self.tick_count += 1
-        return self.tick_count % self.tick_slow_factor == 0
+        if self.wake_ticks > 0:
+            self.wake_ticks -= 1
+        return True
 
     def alert(self):
         pass
@@ -2674,6 +3439,11 @@ class AIBotTracker(AIBot):
         self.combat_class = CombatClassFactory.get_combat_class_by_name(self.bot_entity.name)
         self.sight_range = self.combat_class.get_property("SightRange")
 
+        # Use the combat class's speed if it has one
+        speed = self.combat_class.get_property("Speed")
+        if speed is not None and speed > 0:
+            self.speed = speed
+
     def tick(self) -> bool:
         """
         Tick this Bot
@@ -2701,12 +3471,13 @@ class AIBotTracker(AIBot):
         d = self.distance_to_target(self.target_entity)
         target_dex_modifier = self.target_entity.fighter.get_property_modifier("DEX")
         target_in_range = d <= max(4, self.sight_range - target_dex_modifier)
-        target_in_sight = self.bot_entity.xy in self.floor.get_fov_cells()
+        target_in_sight = self.floor.is_in_fov(self.bot_entity.x, self.bot_entity.y)
 
         # If we can attack it....
         attack_range = self.bot_entity.fighter.current_weapon_details.get_property("Range")
         if d <= attack_range:
-            print(f'{self.bot_entity.name}: "I can attack you {self.target_entity.name} as range {d}<={attack_range}"')
+            ai_logger.debug('%s: "I can attack you %s as range %s<=%s"',
+                            self.bot_entity.name, self.target_entity.name, d, attack_range)
             self.floor.attack_entity(self.bot_entity, self.target_entity)
 
         # if we can see it move closer...
@@ -2715,31 +3486,65 @@ class AIBotTracker(AIBot):
             bx, by = self.bot_entity.xy
             tx, ty = self.target_entity.xy
 
-            # Try and track the target's X position
-            if tx != bx:
-                if tx < bx:
-                    self.floor.move_entity(self.bot_entity, -1, 0, include_player=True)
-                elif tx > bx:
-                    self.floor.move_entity(self.bot_entity, 1, 0, include_player=True)
+            # Try and follow the Floor's path to the player
+            # If that didn't work then fall back to tracking the target's X and Y position
+            if self.follow_player_path() is False:
+
+                # Try and track the target's X position
+                if tx != bx:
+                    if tx < bx:
+                        self.floor.move_entity(self.bot_entity, -1, 0, include_player=True)
+                    elif tx > bx:
+                        self.floor.move_entity(self.bot_entity, 1, 0, include_player=True)
 
-            # Try and track the target's Y position
-            if ty != by:
-                if ty < by:
-                    self.floor.move_entity(self.bot_entity, 0, -1, include_player=True)
-                elif ty > by:
-                    self.floor.move_entity(self.bot_entity, 0, 1, include_player=True)
+                # Try and track the target's Y position
+                if ty != by:
+                    if ty < by:
+                        self.floor.move_entity(self.bot_entity, 0, -1, include_player=True)
+                    elif ty > by:
+                        self.floor.move_entity(self.bot_entity, 0, 1, include_player=True)
 
             # If we moved and are still in sight of the target then all good
             success = (bx, by) != self.bot_entity.xy or target_in_range
 
-            print(
-                f'{self.bot_entity.name}: "I can see you {self.target_entity.name} at d={d} with my range={self.sight_range} and your dex={target_dex_modifier}"')
+            ai_logger.debug('%s: "I can see you %s at d=%s with my range=%s and your dex=%s"',
+                            self.bot_entity.name, self.target_entity.name, d, self.sight_range, target_dex_modifier)
 
         if self._debug is True and self.failed_ticks > 0:
-            print("Failed {0} vs. limit {1}".format(self.failed_ticks, self.failed_ticks_limit))
+            ai_logger.debug("Failed %d vs. limit %d", self.failed_ticks, self.failed_ticks_limit)
 
         return success
 
+    def follow_player_path(self) -> bool:
+        """
+        Move towards the player using the Floor's distance map.
+        Like tracking the target's position we can take one step along each axis per tick.
+        :return: True if we managed to move
+        """
+        if self.target_entity is not self.floor.player:
+            return False
+
+        moved = False
+        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+        for i in range(2):
+            step = self.floor.get_step_towards_player(self.bot_entity.x, self.bot_entity.y, directions)
+            if step is None:
+                break
+
+            old_xy = self.bot_entity.xy
+            self.floor.move_entity(self.bot_entity, *step, include_player=True)
+            if self.bot_entity.xy == old_xy:
+                break
+
+            moved = True
+
+            # Next step has to be along the other axis
+            dx, dy = step
+            directions = [(0, -1), (0, 1)] if dx != 0 else [(-1, 0), (1, 0)]
+
+        return moved
+
     def reset(self):
         super().reset()
         self.failed_ticks = 0
@@ -2839,18 +3644,19 @@ class AbilityCheck:
         else:
 
             # did we pass the check?
-            if self.difficulty_value <= (random.randint(1, 20) + ability_modifier):
+            rng = get_stream(RandomStreams.CHECKS)
+            if self.difficulty_value <= (rng.randint(1, 20) + ability_modifier):
                 success = True
                 self.entity.set_property("IsCheckable", False)
                 if len(self.success_rewards) > 0:
-                    reward_name = random.choice(self.success_rewards)
+                    reward_name = rng.choice(self.success_rewards)
                     self.success_reward = EntityFactory.get_entity_by_name(reward_name)
 
             # We failed the check...
             else:
                 success = False
                 if len(self.failure_rewards) > 0:
-                    reward_name = random.choice(self.failure_rewards)
+                    reward_name = rng.choice(self.failure_rewards)
                     self.failure_reward = EntityFactory.get_entity_by_name(reward_name)
 
         # Decrement the number of remaining check attempts available
@@ -2874,13 +3680,13 @@ class AbilityChecksFactory:
         file_to_open = data_folder / "data" / file_name
 
         # Read in the csv file
-        AbilityChecksFactory.ability_checks = pd.read_csv(file_to_open, encoding='latin1')
+        AbilityChecksFactory.ability_checks = DataPack.read_csv(file_to_open)
         df = AbilityChecksFactory.ability_checks
         df.set_index(["Entity", "Ability"], drop=True, inplace=True)
         df.fillna("", inplace=True)
 
-        print(df.head())
-        print(df.dtypes)
+        if data_logger.isEnabledFor(logging.DEBUG):
+            data_logger.debug("Loaded %s:\n%s\n%s", file_name, df.head(), df.dtypes)
 
     @staticmethod
     def get_ability_check(entity_name: str, ability_name: str):
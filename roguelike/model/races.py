@@ -1,7 +1,9 @@
-import pandas as pd
 from pathlib import Path
 import logging
 
+from roguelike.model.data_pack import DataPack
+from roguelike.model.logs import data_logger
+
 class Race:
     def __init__(self, name:str):
         self.name = name
@@ -32,10 +34,11 @@ class RaceFactory:
         file_to_open = data_folder / "data" / file_name
 
         # Read in the csv file
-        RaceFactory.races = pd.read_csv(file_to_open)
+        RaceFactory.races = DataPack.read_csv(file_to_open)
         RaceFactory.races.set_index("Race", drop=True, inplace=True)
 
-        print(RaceFactory.races.tail(10))
+        if data_logger.isEnabledFor(logging.DEBUG):
+            data_logger.debug("Loaded %s:\n%s", file_name, RaceFactory.races.tail(10))
 
     @staticmethod
     def get_available_races()->list:
@@ -51,7 +54,7 @@ class RaceFactory:
             e.add_properties(row.iloc[:].to_dict())
 
         else:
-            logging.warning(f"Can't find race {name} in factory!")
+            data_logger.warning("Can't find race %s in factory!", name)
 
         return e
 
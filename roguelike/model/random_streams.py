@@ -0,0 +1,89 @@
+import contextlib
+import hashlib
+import random
+import threading
+
+# The RandomStreams that are in use by each thread
+_active = threading.local()
+
+
+def get_stream(name: str):
+    """
+    Get a random number stream from the RandomStreams that are active in this thread
+    :param name: the name of the stream e.g. RandomStreams.DICE
+    :return: the stream or the random module itself if no RandomStreams are active
+    """
+    streams = getattr(_active, "streams", None)
+    if streams is None:
+        return random
+    return streams.get_stream(name)
+
+
+class RandomStreams:
+    """
+    Independent random number generators that are all derived from one master seed.
+    Each stream is seeded from a hash of the master seed and the stream's keys so the numbers that it produces
+    don't depend on how much any other stream has been used or on which process or thread is using it.
+    """
+
+    # Streams for each subsystem
+    GENERATION = "generation"
+    COMBAT = "combat"
+    DICE = "dice"
+    CHECKS = "checks"
+    ITEMS = "items"
+    LORE = "lore"
+
+    # Keys for deriving the seeds of other RandomStreams e.g. one per Floor
+    FLOOR = "floor"
+    SHOP = "shop"
+
+    def __init__(self, seed: int = None):
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.streams = {}
+
+    @staticmethod
+    def derive_seed(seed: int, *keys) -> int:
+        """
+        Derive a new seed from a seed and some keys
+        :param seed: the seed to start from
+        :param keys: the keys e.g. "floor", 3
+        :return: a 64 bit seed
+        """
+        text = ":".join(str(key) for key in (seed,) + keys)
+        return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+
+    def get_seed(self, *keys) -> int:
+        return RandomStreams.derive_seed(self.seed, *keys)
+
+    def get_stream(self, *keys) -> random.Random:
+        """
+        Get the stream for the specified keys creating it if we haven't used it yet
+        :param keys: the keys of the stream e.g. RandomStreams.COMBAT
+        :return: the random number generator for this stream
+        """
+        stream = self.streams.get(keys)
+        if stream is None:
+            stream = random.Random(self.get_seed(*keys))
+            self.streams[keys] = stream
+        return stream
+
+    def activate(self):
+        """
+        Make these the streams that get_stream() uses in this thread
+        :return: the streams that were active before
+        """
+        previous = getattr(_active, "streams", None)
+        _active.streams = self
+        return previous
+
+    @contextlib.contextmanager
+    def using(self):
+        """
+        Make these the active streams until the end of the with block
+        """
+        previous = self.activate()
+        try:
+            yield self
+        finally:
+            _active.streams = previous
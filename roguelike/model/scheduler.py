@@ -0,0 +1,77 @@
+import heapq
+
+
+class TurnScheduler:
+    """
+    Priority queue of actors ordered by the time of their next action.
+    Actors with a higher speed get scheduled to act again sooner than slower ones.
+    Actors that are scheduled at the same time act in the order that they were scheduled.
+    """
+
+    # Speed of a normal actor and how long it takes them to perform one action
+    NORMAL_SPEED = 100
+    ACTION_TIME = 100
+
+    def __init__(self):
+        self.now = 0
+        self._queue = []
+        self._entries = {}
+        self._counter = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, actor):
+        return actor in self._entries
+
+    @staticmethod
+    def get_action_delay(speed: float = None) -> float:
+        """
+        How long does it take an actor of a specified speed to perform an action?
+        :param speed: the speed of the actor.  Default is normal speed
+        :return: the time until the actor can act again
+        """
+        if speed is None or not speed > 0:
+            speed = TurnScheduler.NORMAL_SPEED
+
+        return TurnScheduler.ACTION_TIME * TurnScheduler.NORMAL_SPEED / speed
+
+    def schedule(self, actor, delay: float = 0):
+        """
+        Schedule an actor to act after a specified delay.  Replaces any existing schedule for the actor.
+        :param actor: the actor that you want to schedule
+        :param delay: how long from now until the actor acts
+        """
+        self.remove(actor)
+        self._counter += 1
+        entry = [self.now + delay, self._counter, actor]
+        self._entries[actor] = entry
+        heapq.heappush(self._queue, entry)
+
+    def remove(self, actor):
+        """
+        Remove an actor from the schedule if it is in it
+        :param actor: the actor that you want to remove
+        """
+        entry = self._entries.pop(actor, None)
+        if entry is not None:
+            # Mark the entry as removed rather than searching the heap for it
+            entry[-1] = None
+
+    def pop(self):
+        """
+        Get the next actor that is due to act and move the clock on to the time of its action
+        :return: the next actor or None if no actors are scheduled
+        """
+        while len(self._queue) > 0:
+            time, count, actor = heapq.heappop(self._queue)
+            if actor is not None:
+                del self._entries[actor]
+                self.now = time
+                return actor
+
+        return None
+
+    def clear(self):
+        self._queue = []
+        self._entries = {}
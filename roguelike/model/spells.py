@@ -1,9 +1,10 @@
+import logging
 import math
 from pathlib import Path
 
-import pandas as pd
-
 from roguelike.model.dice import DnD_Dice
+from roguelike.model.data_pack import DataPack
+from roguelike.model.logs import combat_logger, data_logger
 
 
 class SpellBookException(Exception):
@@ -76,7 +77,7 @@ class Spell:
     def use(self):
         if self.frequency != Spell.FREQUENCY_AT_WILL:
             self.used = True
-            print(f'\t******** Spell {self.name} just got used!')
+            combat_logger.debug("Spell %s just got used!", self.name)
 
     def reset(self):
         self.used = False
@@ -144,7 +145,8 @@ class SpellBook:
         # What is the maximum of this frequency that we are allowed?
         max_count_for_frequency = self.max_per_frequency.get(new_spell.frequency,1)
 
-        print(f'frequency={new_spell.frequency}: current={matching_spell_count}, max={max_count_for_frequency}')
+        data_logger.debug("frequency=%s: current=%d, max=%d",
+                          new_spell.frequency, matching_spell_count, max_count_for_frequency)
 
         if new_spell.class_name != self.class_name:
             raise SpellBookException(f"You are a {self.class_name}, you cannot learn {new_spell.class_name} spells")
@@ -294,12 +296,12 @@ class SpellFactory:
         file_to_open = data_folder / "data" / file_name
 
         # Read in the csv file
-        SpellFactory.spells = pd.read_csv(file_to_open)
+        SpellFactory.spells = DataPack.read_csv(file_to_open)
         df = SpellFactory.spells
         df.set_index(["Class", "Name"], drop=True, inplace=True)
 
-        print(df.head())
-        print(df.dtypes)
+        if data_logger.isEnabledFor(logging.DEBUG):
+            data_logger.debug("Loaded %s:\n%s\n%s", file_name, df.head(), df.dtypes)
 
     @staticmethod
     def row_to_spell(row) -> Spell:
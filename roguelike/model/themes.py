@@ -1,10 +1,13 @@
-import pandas as pd
 from pathlib import Path
-import random
 import tcod as libtcod
+import tcod.random
 import copy
 import textwrap
 
+from roguelike.model.data_pack import DataPack
+from roguelike.model.logs import data_logger
+from roguelike.model.random_streams import RandomStreams, get_stream
+
 class Palette:
     """
     Class for holding the palette of colours for various features on a Floor
@@ -57,7 +60,7 @@ class Palette:
         try:
             c = eval(f'libtcod.{color_text.lower()}')
             if isinstance(c, libtcod.color.Color) is False:
-                print(f"We didn't end up with a colour from text {color_text}!")
+                data_logger.warning("We didn't end up with a colour from text %s!", color_text)
                 c = None
         except AttributeError:
             # print(f"{color_text} is not a valid attribute")
@@ -128,6 +131,7 @@ class ThemeManager:
 
     room_names = None
     room_palettes = None
+    name_random = None
     floor_palettes = None
     available_themes = set()
 
@@ -146,7 +150,7 @@ class ThemeManager:
         file_to_open = data_folder / "data" / "themes" / file_name
 
         # Read in the csv file
-        ThemeManager.room_names = pd.read_csv(file_to_open)
+        ThemeManager.room_names = DataPack.read_csv(file_to_open)
         df = ThemeManager.room_names
         df.set_index("Theme", drop=True, inplace=True)
 
@@ -172,7 +176,7 @@ class ThemeManager:
 
     @staticmethod
     def get_random_room_name_by_theme(theme_name:str)->str:
-        return random.choice(ThemeManager.get_room_names_by_theme(theme_name))
+        return get_stream(RandomStreams.LORE).choice(ThemeManager.get_room_names_by_theme(theme_name))
 
     @staticmethod
     def load_room_colour_palettes(file_name:str):
@@ -181,7 +185,7 @@ class ThemeManager:
         file_to_open = data_folder / "data" / "themes" / file_name
 
         # Read in the csv file
-        ThemeManager.room_palettes = pd.read_csv(file_to_open)
+        ThemeManager.room_palettes = DataPack.read_csv(file_to_open)
         df = ThemeManager.room_palettes
         df.set_index("Theme", drop=True, inplace=True)
 
@@ -198,7 +202,21 @@ class ThemeManager:
         data_folder = Path(__file__).resolve().parent
         file_to_open = data_folder / "data" / "themes" / file_name
 
-        libtcod.namegen_parse(str(file_to_open))
+        # Give the name generator its own random number generator so that we can seed it
+        if ThemeManager.name_random is None:
+            ThemeManager.name_random = tcod.random.Random(tcod.random.MERSENNE_TWISTER)
+
+        libtcod.namegen_parse(str(file_to_open), ThemeManager.name_random.random_c)
+
+    @staticmethod
+    def seed_names(seed: int):
+        """
+        Reset the name generator's random number generator to a specified seed
+        :param seed: the new seed
+        """
+        if ThemeManager.name_random is not None:
+            libtcod.random_restore(ThemeManager.name_random,
+                                   tcod.random.Random(tcod.random.MERSENNE_TWISTER, seed & 0xFFFFFFFF))
 
 
     @staticmethod
@@ -243,6 +261,10 @@ class ThemeManager:
         # See what name generate sets we have loaded
         ng_sets = libtcod.namegen_get_sets()
 
+        # Seed the name generator from the Lore random number stream so that the names are reproducible
+        rng = get_stream(RandomStreams.LORE)
+        ThemeManager.seed_names(rng.getrandbits(32))
+
         # Get the name of the template that we want to expand
         template = templates.get(theme)
 
@@ -257,7 +279,7 @@ class ThemeManager:
             # Otherwise...
             else:
                 # Pick a random item from the segment
-                a = random.choice(aa)
+                a = rng.choice(aa)
 
                 # If the segment a template?  If so recursive call to expand the template
                 if a in templates:
@@ -305,7 +327,7 @@ class ThemeManager:
 
         assert theme_name in ThemeManager.room_palettes.index, f'{theme_name} not in room colour themes'
 
-        return random.choice(ThemeManager.get_room_colours_by_theme(theme_name))
+        return get_stream(RandomStreams.GENERATION).choice(ThemeManager.get_room_colours_by_theme(theme_name))
 
     def load_floor_colour_palettes(file_name:str):
         # Create path for the file that we are going to load
@@ -313,7 +335,7 @@ class ThemeManager:
         file_to_open = data_folder / "data" / "themes" / file_name
 
         # Read in the csv file
-        ThemeManager.floor_palettes = pd.read_csv(file_to_open)
+        ThemeManager.floor_palettes = DataPack.read_csv(file_to_open)
         df = ThemeManager.floor_palettes
         df.set_index("Theme", drop=True, inplace=True)
 
@@ -1,9 +1,11 @@
+import contextlib
 import math
 import random
 from pathlib import Path
 
 import roguelike.model as model
 from roguelike.model import Palette
+from roguelike.model.logs import view_logger
 from .view_utils import *
 
 
@@ -29,7 +31,7 @@ class View():
 
     def process_event(self, new_event: model.Event):
         if self._debug is True:
-            print(f'{__class__} processing event {new_event}')
+            view_logger.debug("%s processing event %s", __class__, new_event)
 
     def draw(self):
         pass
@@ -126,6 +128,9 @@ class MainFrame(View):
         self.text_entry = TextEntryBox()
         self.frame1 = None
 
+        # Optional timer for recording how long drawing each View takes
+        self.frame_timer = None
+
     @property
     def mode(self):
         return self._mode
@@ -279,16 +284,19 @@ class MainFrame(View):
         if self.mode == MainFrame.MODE_PLAYING:
 
             # Blit the current floor
-            self.floor_view.draw()
-            libtcod.console_blit(self.floor_view.con,
-                                 0, 0,
-                                 self.floor_view.width, self.floor_view.height,
-                                 0,
-                                 0, 0, ffade=1, bfade=1)
+            with self.timed("FloorView"):
+                self.floor_view.draw()
+            with self.timed("FloorView blit"):
+                libtcod.console_blit(self.floor_view.con,
+                                     0, 0,
+                                     self.floor_view.width, self.floor_view.height,
+                                     0,
+                                     0, 0, ffade=1, bfade=1)
 
         # If we are in INVENTORY mode then draw the inventory screen
         elif self.mode == MainFrame.MODE_INVENTORY_SCREEN:
-            self.inventory_view.draw()
+            with self.timed("InventoryView"):
+                self.inventory_view.draw()
             bx = int((self.width - self.inventory_view.width) / 2)
             by = int((self.height - self.inventory_view.height) / 2)
             by = 1
@@ -304,7 +312,8 @@ class MainFrame(View):
         # If we are in CHARACTER mode then draw the character screen
         elif self.mode == MainFrame.MODE_CHARACTER_SCREEN:
             # Redraw the character view
-            self.character_view.draw()
+            with self.timed("CharacterView"):
+                self.character_view.draw()
             bx = int((self.width - self.character_view.width) / 2)
             by = int((self.height - self.character_view.height) / 2)
             by = 1
@@ -320,7 +329,8 @@ class MainFrame(View):
         # If we are in JOURNAL mode then draw the character screen
         elif self.mode == MainFrame.MODE_JOURNAL_SCREEN:
             # Redraw the character view
-            self.journal_view.draw()
+            with self.timed("JournalView"):
+                self.journal_view.draw()
             bx = int((self.width - self.journal_view.width) / 2)
             by = int((self.height - self.journal_view.height) / 2)
             by = 1
@@ -336,7 +346,8 @@ class MainFrame(View):
         # If we are in JOURNAL mode then draw the character screen
         elif self.mode == MainFrame.MODE_SPELLBOOK_SCREEN:
             # Redraw the character view
-            self.spellbook_view.draw()
+            with self.timed("SpellBookView"):
+                self.spellbook_view.draw()
             bx = int((self.width - self.journal_view.width) / 2)
             by = int((self.height - self.journal_view.height) / 2)
             by = 1
@@ -351,7 +362,8 @@ class MainFrame(View):
 
         # If we are in SHOP mode then draw the inventory screen
         elif self.mode == MainFrame.MODE_SHOP_SCREEN:
-            self.shop_view.draw()
+            with self.timed("ShopView"):
+                self.shop_view.draw()
             bx = int((self.width - self.shop_view.width) / 2)
             by = int((self.height - self.shop_view.height) / 2)
             by = 1
@@ -367,7 +379,8 @@ class MainFrame(View):
         # If we are in CHARACTER CREATION mode then draw the character creation screen
         elif self.mode == MainFrame.MODE_CHARACTER_CREATION_SCREEN:
             # Redraw the character creation view
-            self.character_creation_view.draw()
+            with self.timed("CreateCharacterView"):
+                self.character_creation_view.draw()
             bx = int((self.width - self.character_creation_view.width) / 2)
             by = int((self.height - self.character_creation_view.height) / 2)
             by = 1
@@ -431,14 +444,16 @@ class MainFrame(View):
             so.render(0, int(self.width / 2), by + 2, alignment=libtcod.CENTER)
 
         # Blit the message panel
-        self.message_panel.draw()
-        libtcod.console_blit(self.message_panel.con,
-                             0, 0,
-                             self.message_panel.width,
-                             self.message_panel.height,
-                             0,
-                             0, self.height - MainFrame.CONSOLE_MESSAGE_PANEL_HEIGHT,
-                             ffade=1, bfade=1)
+        with self.timed("MessagePanel"):
+            self.message_panel.draw()
+        with self.timed("MessagePanel blit"):
+            libtcod.console_blit(self.message_panel.con,
+                                 0, 0,
+                                 self.message_panel.width,
+                                 self.message_panel.height,
+                                 0,
+                                 0, self.height - MainFrame.CONSOLE_MESSAGE_PANEL_HEIGHT,
+                                 ffade=1, bfade=1)
 
         # Draw the status line
         x = 0
@@ -514,8 +529,38 @@ class MainFrame(View):
         libtcod.console_set_default_foreground(0, Palette.dim_hsl(fg, 2.0))
         libtcod.console_print_ex(0, cx, y, flag=libtcod.BKGND_NONE, alignment=libtcod.CENTER, fmt=xp_text)
 
+        # Draw frame timings if they are switched on
+        if self.frame_timer is not None and self.frame_timer.enabled is True:
+            self.draw_frame_timings()
+
+        with self.timed("flush"):
+            libtcod.console_flush()
+
+    def timed(self, phase: str):
+        """
+        Time a phase of drawing the MainFrame if we have a frame timer
+        :param phase: the name of the phase
+        """
+        if self.frame_timer is None:
+            return contextlib.nullcontext()
+
+        return self.frame_timer.phase(phase)
 
-        libtcod.console_flush()
+    def draw_frame_timings(self):
+        """
+        Draw an overlay in the top right corner with the p50, p95 and p99 timings of each phase of a frame
+        """
+        lines = ["Timings (ms)     p50    p95    p99"]
+        for phase in self.frame_timer.phases:
+            percentiles = self.frame_timer.get_percentiles(phase)
+            if percentiles is not None:
+                p50, p95, p99 = percentiles
+                lines.append(f'{phase[:13]:<13}{p50:7.1f}{p95:7.1f}{p99:7.1f}')
+
+        libtcod.console_set_default_foreground(0, libtcod.light_yellow)
+        libtcod.console_set_default_background(0, libtcod.darkest_grey)
+        for y, line in enumerate(lines):
+            libtcod.console_print_ex(0, self.width - 1, y, flag=libtcod.BKGND_SET, alignment=libtcod.RIGHT, fmt=line)
 
     def print(self):
         print(f'Spell:{self.spellbook_view.selected_spell}')
@@ -563,7 +608,14 @@ class FloorView(View):
         self.bg_explored_wall = self.theme_palette.get("BG_EXPLORED_WALL")
 
         # Create a new console to draw on
-        self.con = libtcod.console_new(self.width, self.height)
+        # Use [x, y] ordering so that the console arrays line up with the Floor arrays
+        self.con = libtcod.console.Console(self.width, self.height, order="F")
+
+        # Theme colours as arrays so that we can use them in bulk
+        self.bg_lit_path_rgb = np.array(list(self.bg_lit_path))
+        self.bg_lit_wall_rgb = np.array(list(self.bg_lit_wall))
+        self.bg_explored_path_rgb = np.array(list(self.bg_explored_path))
+        self.bg_explored_wall_rgb = np.array(list(self.bg_explored_wall))
 
     def draw(self):
 
@@ -571,49 +623,8 @@ class FloorView(View):
         self.con.default_bg = self.bg
         libtcod.console_clear(self.con)
 
-        # Get the types of cells that we need to draw
-        explored_cells = self.floor.get_explored_cells()
-        fov_cells = self.floor.get_fov_cells()
-        walkable_cells = self.floor.get_walkable_cells()
-
-        max_l = 100
-
-        # Loop through all of the cells that we have already explored
-        for x, y in explored_cells:
-
-            # For the cells in the current FOV
-            if (x, y) in fov_cells:
-
-                # Get how much we should dim the tile colour based on distance from player
-                a = min(int(self.floor.get_fov_light_attenuation(x, y, max_l)), max_l)
-
-                # If Lit path...
-                if (x, y) in walkable_cells:
-
-                    # Get the tile colour
-                    tile_rgb = list(self.floor.floor_tile_colours[x, y])
-                    if tile_rgb == [0, 0, 0]:
-                        tile_rgb = list(self.bg_lit_path)
-
-                    # Dim the tile colour
-                    tile_colour = dim_rgb(tile_rgb, 0)
-
-                    # Use linear interpolation to shade from lit path to unlit path based on distance from player
-                    tile_colour = libtcod.color_lerp(tile_colour, self.bg_explored_path, a / max_l)
-                    libtcod.console_set_char_background(self.con, x, y, tile_colour)
-
-                # Else lit wall
-                else:
-                    # Use linear interpolation to shade from lit wall to unlit wall based on distance from player
-                    tile_colour = libtcod.color_lerp(self.bg_lit_wall, self.bg_explored_wall, a / max_l)
-                    libtcod.console_set_char_background(self.con, x, y, tile_colour)
-            else:
-                # Unlit path
-                if (x, y) in walkable_cells:
-                    libtcod.console_set_char_background(self.con, x, y, self.bg_explored_path)
-                # Else unlit wall
-                else:
-                    libtcod.console_set_char_background(self.con, x, y, self.bg_explored_wall)
+        # Draw all of the floor tiles that we have already explored
+        self.draw_floor_tiles()
 
         # Draw any entities that have been revealed to the player
         for e in self.floor.get_revealed_entities():
@@ -626,15 +637,14 @@ class FloorView(View):
                     libtcod.console_set_char_background(self.con, x, y, bg)
                 # If no background colour for this entity then use the current tile colour with 'shadow'
                 else:
-                    tile_bg = self.floor.floor_tile_colours[x, y]
+                    tile_bg = self.floor.get_floor_tile_colour(x, y)
                     bg = dim_rgb(tile_bg, 10)
                     libtcod.console_set_char_background(self.con, x, y, bg)
             except Exception as ex:
-                print(f"Problem drawing {e.name} {e.fg} {e.bg}")
-                print(ex)
+                view_logger.warning("Problem drawing %s %s %s: %s", e.name, e.fg, e.bg, ex)
 
         # Draw all of the entities in the current FOV by Z order
-        fov_entities = [e for e in self.floor.entities if e.xy in fov_cells]
+        fov_entities = self.floor.get_entities_in_fov()
         if len(fov_entities) > 0:
             entities = sorted(fov_entities, key=lambda x: x.get_property("Zorder"), reverse=True)
             for e in entities:
@@ -658,7 +668,7 @@ class FloorView(View):
                         libtcod.console_set_char_background(self.con, x, y, bg)
                     # If no background colour for this entity then use the current tile colour with 'shadow'
                     else:
-                        tile_bg = self.floor.floor_tile_colours[x, y]
+                        tile_bg = self.floor.get_floor_tile_colour(x, y)
 
                         if e != self.floor.player.fighter.last_target:
                             bg = dim_rgb(tile_bg, 10)
@@ -669,12 +679,11 @@ class FloorView(View):
                         libtcod.console_set_char_background(self.con, x, y, bg)
 
                 except Exception as ex:
-                    print(f"Problem drawing {e.name} {e.fg} {e.bg}")
-                    print(ex)
+                    view_logger.warning("Problem drawing %s %s %s: %s", e.name, e.fg, e.bg, ex)
 
         # Draw the player and a 'shadow' on the floor tile
         p = self.floor.player
-        player_tile_bg = self.floor.floor_tile_colours[p.x, p.y]
+        player_tile_bg = self.floor.get_floor_tile_colour(p.x, p.y)
         bg = dim_rgb(player_tile_bg, 20)
         libtcod.console_set_default_foreground(self.con, p.fg)
         libtcod.console_set_default_background(self.con, bg)
@@ -688,6 +697,43 @@ class FloorView(View):
                 fg=libtcod.red, bg=libtcod.white)
             s.render(self.con, 0, 0, alignment=libtcod.LEFT)
 
+    def draw_floor_tiles(self):
+        """
+        Draw the background colour of every explored floor tile straight into the console's bg array:-
+        - unlit paths and walls use the explored path and wall colours
+        - lit paths and walls are shaded from their lit colour to their explored colour based on distance from player
+        """
+        # The console can be bigger than the Floor so only draw the part that the Floor covers
+        bg = self.con.bg[:self.floor.width, :self.floor.height]
+
+        # Get the masks of the types of cells that we need to draw
+        explored = self.floor.explored
+        walkable = self.floor.walkable
+        lit = explored & self.floor.fov_map
+
+        # Unlit paths and walls
+        bg[explored & walkable] = self.bg_explored_path_rgb
+        bg[explored & ~walkable] = self.bg_explored_wall_rgb
+
+        # Get how much we should dim each lit tile colour based on distance from player
+        max_l = 100
+        xs, ys = np.nonzero(lit)
+        px, py = self.floor.player.xy
+        a = np.minimum((max_l * ((xs - px) ** 2 + (ys - py) ** 2) / self.floor.fov_radius2).astype(int), max_l)
+        coef = a / max_l
+
+        # Lit paths use their tile colour (or the default lit path colour if they don't have one)...
+        lit_path = walkable[xs, ys][:, np.newaxis]
+        tile_rgb = self.floor.floor_tile_colours[xs, ys]
+        tile_rgb = np.where(np.any(tile_rgb != 0, axis=1)[:, np.newaxis], tile_rgb, self.bg_lit_path_rgb)
+
+        # ...and lit walls use the lit wall colour
+        lit_rgb = np.where(lit_path, tile_rgb, self.bg_lit_wall_rgb)
+        unlit_rgb = np.where(lit_path, self.bg_explored_path_rgb, self.bg_explored_wall_rgb)
+
+        # Use linear interpolation to shade from lit to unlit based on distance from player
+        bg[xs, ys] = model.lerp_rgb(lit_rgb, unlit_rgb, coef)
+
 
 class MessagePanel(View):
     BORDER_TYPE1 = "type1"
@@ -954,7 +1000,7 @@ class InventoryView(View):
                 libtcod.console_put_char_ex(self.con, x, y, e.char, fore=e.fg, back=e.bg)
                 self.con.print(x + 1, y, f'{coin_value:<2}', fg=self.fg, bg=None)
             except Exception:
-                print(f"Problem drawing {e.name} {e.fg} {e.bg}")
+                view_logger.warning("Problem drawing %s %s %s", e.name, e.fg, e.bg)
 
             x += 4
 
@@ -1049,7 +1095,7 @@ class InventoryView(View):
                     else:
                         libtcod.console_set_char_background(self.con, 2, y, libtcod.light_gray)
                 except Exception:
-                    print(f"Problem drawing {e.name} {e.fg} {e.bg}")
+                    view_logger.warning("Problem drawing %s %s %s", e.name, e.fg, e.bg)
 
                 y += 1
 
@@ -1105,7 +1151,7 @@ class InventoryView(View):
                     else:
                         libtcod.console_set_char_background(self.con, 2, y, libtcod.light_gray)
                 except Exception:
-                    print(f"Problem drawing {e.name} {e.fg} {e.bg}")
+                    view_logger.warning("Problem drawing %s %s %s", e.name, e.fg, e.bg)
 
                 y += 1
 
@@ -1378,7 +1424,7 @@ class ShopView(View):
                     else:
                         libtcod.console_set_char_background(self.con, x, y, libtcod.light_grey)
                 except Exception:
-                    print(f"Problem drawing {e.name} {e.fg} {e.bg}")
+                    view_logger.warning("Problem drawing %s %s %s", e.name, e.fg, e.bg)
 
                 # Draw the selected item's value as coins
                 try:
@@ -1393,7 +1439,7 @@ class ShopView(View):
                             x += 1 + len(str(count))
 
                 except Exception:
-                    print(f"Problem drawing {e.name} {e.fg} {e.bg}")
+                    view_logger.warning("Problem drawing %s %s %s", e.name, e.fg, e.bg)
 
                 y += 1
 
@@ -1460,7 +1506,7 @@ class ShopView(View):
                     else:
                         libtcod.console_set_char_background(self.con, x, y, libtcod.light_grey)
                 except Exception:
-                    print(f"Problem drawing {e.name} {e.fg} {e.bg}")
+                    view_logger.warning("Problem drawing %s %s %s", e.name, e.fg, e.bg)
 
                 # Draw the selected item's value as coins
                 try:
@@ -1475,7 +1521,7 @@ class ShopView(View):
                             x += 1 + len(str(count))
 
                 except Exception:
-                    print(f"Problem drawing {e.name} {e.fg} {e.bg}")
+                    view_logger.warning("Problem drawing %s %s %s", e.name, e.fg, e.bg)
 
                 y += 1
 
@@ -1494,7 +1540,7 @@ class ShopView(View):
                 libtcod.console_put_char_ex(self.con, x, y, e.char, fore=e.fg, back=e.bg)
                 self.con.print(x + 1, y, f'{coin_value:.>3}', fg=self.fg, bg=None)
             except Exception:
-                print(f"Problem drawing {e.name} {e.fg} {e.bg}")
+                view_logger.warning("Problem drawing %s %s %s", e.name, e.fg, e.bg)
 
             y += 1
 
@@ -2038,7 +2084,7 @@ class ItemPickerView(View):
         self.border = Boxes.get_box(self.width, self.height, border_type=self.border_type)
 
     def process_event(self, new_event: model.Event):
-        print(f'{__class__}: Event {new_event}')
+        view_logger.debug("%s: Event %s", __class__, new_event)
 
     def change_selection(self, d: int):
 
@@ -3,6 +3,8 @@ import textwrap
 import numpy as np
 import tcod as libtcod
 
+from roguelike.model.logs import view_logger
+
 
 def dim_rgb(rgb, dc: int):
     """
@@ -219,8 +221,7 @@ class TextEntryBox:
         self.con.default_fg = self.fg
         self.con.default_bg = self.bg
 
-        print(f"Getting some text (max {max_length} chars)")
-        print(f'Using mask {self.mask}')
+        view_logger.debug("Getting some text (max %d chars) using mask %s", max_length, self.mask)
 
         key = libtcod.Key()
         mouse = None
@@ -1,10 +1,14 @@
 import roguelike.controller as cont
+from roguelike.model.logs import configure_logging
 
 def main():
 
+    configure_logging()
+
     c = cont.Controller("Rogue Dungeon")
     c.initialise()
     c.run()
+    c.end()
 
     exit(0)
 
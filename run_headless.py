@@ -0,0 +1,38 @@
+import argparse
+
+from roguelike.controller.headless import HeadlessController
+from roguelike.model import FloorPrefetcher
+from roguelike.model.logs import configure_logging
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Rogue Dungeon engine without a window")
+    parser.add_argument("--turns", type=int, default=1000, help="number of turns to run for")
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    parser.add_argument("--script", default=None, help="file of actions to run instead of random actions")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="trace Python memory allocations with tracemalloc (slows the run down)")
+    parser.add_argument("--prefetch", action="store_true", help="generate the next floor in a background process")
+    parser.add_argument("--verbose", action="store_true", help="show the game's debug logging")
+    args = parser.parse_args()
+
+    configure_logging("DEBUG" if args.verbose is True else None)
+
+    c = HeadlessController("Rogue Dungeon", seed=args.seed, trace_memory=args.trace_memory,
+                           prefetch_floors=args.prefetch)
+    c.initialise()
+
+    actions = HeadlessController.load_script(args.script) if args.script is not None else None
+    stats = c.run(turns=args.turns, actions=actions)
+    FloorPrefetcher.close()
+
+    for name, value in stats.items():
+        if isinstance(value, float):
+            value = f'{value:.2f}'
+        print(f'{name}={value}')
+
+    exit(0)
+
+
+if __name__ == "__main__":
+    main()